@@ -6,7 +6,7 @@ import os
 import re
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 from pocketflow import AsyncNode
 from pydantic import BaseModel, Field
@@ -17,6 +17,10 @@ from ..utils.mermaid_regenerator import validate_and_fix_file_mermaid
 from ..utils.performance_monitor import TaskMonitoringContext
 from .async_parallel_batch_node import AsyncParallelBatchNode
 
+# 模块文档中的一级标题，以及连同换行符在内的整行标题（用于移除原标题）
+_MODULE_TITLE_RE = re.compile(r"^#\s+(.*)", re.MULTILINE)
+_MODULE_TITLE_LINE_RE = re.compile(r"^#\s+.*\n", re.MULTILINE)
+
 
 class GenerateModuleDetailsNodeConfig(BaseModel):
     """GenerateModuleDetailsNode 配置"""
@@ -82,8 +86,23 @@ class AsyncGenerateModuleDetailsNode(AsyncNode):
         if config:
             merged_config.update(config)
         self.config = GenerateModuleDetailsNodeConfig(**merged_config)
+        # 已确认存在的输出目录，避免每个模块都重复调用 os.makedirs
+        self._created_dirs: Set[str] = set()
         log_and_notify("初始化 AsyncGenerateModuleDetailsNode", "info")
 
+    def _ensure_dir(self, dir_path: str) -> None:
+        """确保目录存在，同一目录只检查一次
+
+        已存在的目录只需一次 stat，不必走 os.makedirs 的 mkdir 失败再检查流程。
+
+        Args:
+            dir_path: 目录路径
+        """
+        if dir_path not in self._created_dirs:
+            if not os.path.isdir(dir_path):
+                os.makedirs(dir_path, exist_ok=True)
+            self._created_dirs.add(dir_path)
+
     async def prep_async(self, shared: Dict[str, Any]) -> Dict[str, Any]:
         """准备阶段，从共享存储中获取核心模块和代码结构
 
@@ -240,10 +259,9 @@ class AsyncGenerateModuleDetailsNode(AsyncNode):
                         )
 
                         if success and quality_score["overall"] >= quality_threshold:
-                            # Ensure modules_dir is created (might be called concurrently)
+                            # modules_dir 已在 exec_async 分发任务前创建
                             repo_specific_output_dir = os.path.join(output_dir, repo_name or "default_repo")
                             modules_dir = os.path.join(repo_specific_output_dir, "modules")
-                            os.makedirs(modules_dir, exist_ok=True)
 
                             file_name_stem = self.parent._get_module_file_name(module_info)
                             # 确保使用 .md 扩展名
@@ -353,6 +371,9 @@ class AsyncGenerateModuleDetailsNode(AsyncNode):
                 "index_file_path": None,
             }  # No modules, but not an error state for the node itself
 
+        # 所有模块文档写入同一目录，分发任务前统一创建一次
+        self._ensure_dir(os.path.join(prep_res["output_dir"], prep_res["repo_name"] or "default_repo", "modules"))
+
         # 创建批处理参数列表
         batch_params = []
         for module_info in modules_to_process:
@@ -444,7 +465,7 @@ class AsyncGenerateModuleDetailsNode(AsyncNode):
                 # Save index file (inside repo_name/modules directory)
                 repo_specific_output_dir = os.path.join(prep_res["output_dir"], prep_res["repo_name"] or "default_repo")
                 modules_dir = os.path.join(repo_specific_output_dir, "modules")
-                os.makedirs(modules_dir, exist_ok=True)  # Ensure dir exists
+                self._ensure_dir(modules_dir)  # Ensure dir exists
 
                 # 确保使用 .md 扩展名
                 index_file_path = os.path.join(modules_dir, "index.md")
@@ -1024,67 +1045,69 @@ if __name__ == "__main__":
         if target_language == "en":
             title = "📚 Module Documentation Index"
 
-        lines = [f"# {title}\n\n"]
-        lines.append("## 📋 概述\n\n")
-        lines.append(
-            "本文档包含对代码库中各个模块的详细说明。通过这些文档，您可以了解每个模块的功能、API和使用方法。\n\n"
-        )
-
-        lines.append("## 📦 模块列表\n\n")
-        lines.append("下表列出了所有可用的模块文档：\n\n")
-        lines.append("| 模块名称 | 模块路径 | 文档链接 |")
-        lines.append("|---|---|---|")
-
-        for doc in sorted(module_docs, key=lambda x: x.get("name", "")):
-            name = doc.get("name", "N/A")
-            module_repo_path = doc.get("path", "N/A")  # Original path in repo
-            # file_path is absolute, need relative path from modules/index.md to modules/module_file.md
-            # Assuming index.md is in "modules" dir, and module files are also in "modules" dir.
-            doc_file_name = os.path.basename(doc.get("file_path", ""))
-            # 确保链接使用 .md 扩展名
-            doc_file_name_md = os.path.splitext(doc_file_name)[0] + ".md"
-            relative_link = f"./{doc_file_name_md}"  # Link from modules/index.md to modules/xxxx.md
-
-            # 使用不带扩展名的文件名作为显示名称
-            display_name = os.path.splitext(doc_file_name)[0]
-            lines.append(f"| {name} | `{module_repo_path}` | [{display_name}]({relative_link}) |")
+        lines = [
+            f"# {title}\n\n",
+            "## 📋 概述\n\n",
+            "本文档包含对代码库中各个模块的详细说明。通过这些文档，您可以了解每个模块的功能、API和使用方法。\n\n",
+            "## 📦 模块列表\n\n",
+            "下表列出了所有可用的模块文档：\n\n",
+            "| 模块名称 | 模块路径 | 文档链接 |",
+            "|---|---|---|",
+        ]
+        # 表格行按模块名排序后一次性生成
+        lines.extend(self._format_index_row(doc) for doc in sorted(module_docs, key=lambda x: x.get("name", "")))
 
         lines.append("\n")
         return "\n".join(lines)
 
+    @staticmethod
+    def _format_index_row(doc: Dict[str, Any]) -> str:
+        """生成模块索引表格中的一行
+
+        Args:
+            doc: 模块文档信息，包含 "name", "path", "file_path"
+
+        Returns:
+            Markdown 表格行
+        """
+        name = doc.get("name", "N/A")
+        module_repo_path = doc.get("path", "N/A")  # Original path in repo
+        # file_path is absolute, need relative path from modules/index.md to modules/module_file.md
+        # Assuming index.md is in "modules" dir, and module files are also in "modules" dir.
+        # 使用不带扩展名的文件名作为显示名称，只拆分一次路径
+        display_name = os.path.splitext(os.path.basename(doc.get("file_path", "")))[0]
+        # 确保链接使用 .md 扩展名
+        relative_link = f"./{display_name}.md"  # Link from modules/index.md to modules/xxxx.md
+        return f"| {name} | `{module_repo_path}` | [{display_name}]({relative_link}) |"
+
     def _process_module_content(self, content: str, module_name: str, repo_name: str) -> str:
         # 检查内容是否包含必要的部分
-        has_title = bool(re.search(r"^#\s+.*", content, re.MULTILINE))
+        has_title = bool(_MODULE_TITLE_RE.search(content))
         has_overview = "概述" in content or "模块概述" in content
         has_api = "API" in content or "函数" in content or "类" in content
         has_examples = "示例" in content or "使用示例" in content
 
-        result_parts = []
-
         # 添加元数据和标题
-        result_parts.extend(self._prepare_metadata_and_title(content, module_name))
-        content = re.sub(r"^#\s+.*\n", "", content, 1, re.MULTILINE) if has_title else content
+        metadata, heading = self._prepare_metadata_and_title(content, module_name)
+        content = _MODULE_TITLE_LINE_RE.sub("", content, count=1) if has_title else content
 
         # 保留原内容或生成默认内容
         if content.strip() and (has_overview or has_api or has_examples):
-            result_parts.append(content)
+            body = content
         else:
-            result_parts.extend(self._generate_default_content(module_name, repo_name))
+            body = "".join(self._generate_default_content(module_name, repo_name))
 
-        return "".join(result_parts)
+        return f"{metadata}{heading}{body}"
 
-    def _prepare_metadata_and_title(self, content: str, module_name: str) -> List[str]:
+    def _prepare_metadata_and_title(self, content: str, module_name: str) -> Tuple[str, str]:
         """准备元数据和标题部分"""
-        parts = []
+        display_name = module_name.replace("_", ".").title()
         # 添加元数据
-        parts.append(f"---\ntitle: {module_name.replace('_', '.').title()}\ncategory: Modules\n---\n\n")
+        metadata = f"---\ntitle: {display_name}\ncategory: Modules\n---\n\n"
         # 添加标题
-        title_match = re.search(r"^#\s+(.*)", content, re.MULTILINE)
-        if title_match:
-            parts.append(f"# 📦 {title_match.group(1)}\n\n")
-        else:
-            parts.append(f"# 📦 {module_name.replace('_', '.').title()}\n\n")
-        return parts
+        title_match = _MODULE_TITLE_RE.search(content)
+        heading = f"# 📦 {title_match.group(1) if title_match else display_name}\n\n"
+        return metadata, heading
 
     def _generate_default_content(self, module_name: str, repo_name: str) -> List[str]:
         """生成默认内容部分"""
@@ -1110,7 +1133,7 @@ if __name__ == "__main__":
         return [
             "## 🔧 类和函数详解\n\n",
             "### 📦 主要类\n\n",
-            f"- `{module_name.split('.')[-1].capitalize()}`: 主要类\n\n",
+            f"- `{module_name.rpartition('.')[2].capitalize()}`: 主要类\n\n",
             "### 📦 主要函数\n\n",
             "- `main()`: 主要函数\n\n",
         ]
@@ -1121,7 +1144,7 @@ if __name__ == "__main__":
             "## 💻 使用示例\n\n",
             "``python\n",
             f"# {module_name} 使用示例\n",
-            f"import {module_name.split('.')[0]}\n\n",
+            f"import {module_name.partition('.')[0]}\n\n",
             "# 示例代码\n",
             "```\n\n",
         ]
@@ -1137,7 +1160,7 @@ if __name__ == "__main__":
             依赖关系文本列表
         """
         # 确保使用module_name参数，避免IDE警告
-        module_display_name = module_name.split(".")[-1]
+        module_display_name = module_name.rpartition(".")[2]
 
         return [
             "## 🔄 依赖关系\n\n",
@@ -1165,8 +1188,9 @@ if __name__ == "__main__":
             content (str): 要保存的內容。
         """
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            # 一次编码后以二进制写入，跳过文本层的逐块编码
+            with open(file_path, "wb") as f:
+                f.write(content.encode("utf-8"))
 
             # 立即修复文件中的 Mermaid 语法错误
             try:
@@ -1192,8 +1216,9 @@ if __name__ == "__main__":
             content (str): 要保存的索引內容。
         """
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            # 一次编码后以二进制写入，跳过文本层的逐块编码
+            with open(file_path, "wb") as f:
+                f.write(content.encode("utf-8"))
 
             # 立即修复文件中的 Mermaid 语法错误
             try:
@@ -1,9 +1,184 @@
 """格式化工具，用于格式化生成的文档内容。"""
 
+import collections
+import functools
+import hashlib
+import json
+import logging
 import os
 import re
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+import string
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .logger import logger
+
+# 并行写入文件时线程池的最大线程数
+_MAX_WRITE_WORKERS = 16
+
+# 写入生成文件时使用的打开标志（Windows 上需要 O_BINARY 避免换行符转换）
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# 模块名到文档路径的字符转换表：下划线转连字符，点号转目录分隔符
+_DOCS_PATH_TABLE = str.maketrans({"_": "-", ".": "/"})
+
+# 源代码路径到文档路径的转换规则：可选的 src/、utils/ 前缀和源文件扩展名会被移除
+_SOURCE_PATH_RE = re.compile(r"^(?:src/)?(?:utils/)?(.*?)(?:\.(?:py|js|java|c|cpp|go|rb))?$", re.DOTALL)
+
+# 目录生成使用的预编译正则：二至六级标题、需移除的 emoji（辅助平面字符）及锚点清理规则
+# 标题正则按多行模式编译，空白不跨越换行，用于一次扫描整篇文本
+_HEADING_MULTILINE_RE = re.compile(r"^[^\S\n]*(#{2,6})[^\S\n]+(.+)$", re.MULTILINE)
+_EMOJI_STRIP_RE = re.compile(r"[\U00010000-\U0010ffff]")
+_ANCHOR_NONWORD_RE = re.compile(r"[^\w\s-]")
+_ANCHOR_WS_RE = re.compile(r"\s+")
+# 纯 ASCII 标题用 str.translate 一次删除 _ANCHOR_NONWORD_RE 会移除的全部 ASCII 字符，无需调用正则
+_ANCHOR_ASCII_TABLE = str.maketrans("", "", "".join(c for c in map(chr, range(128)) if _ANCHOR_NONWORD_RE.match(c)))
+
+# 可添加 emoji 的标题行：缩进、1-6 个 # 与一个空格、标题文本（按行匹配，不跨行）
+_EMOJI_HEADING_RE = re.compile(r"^([^\S\n]*)(#{1,6}) (.*)$", re.MULTILINE)
+
+# 目录条目的缩进，按目录层级（二级标题为 0）索引
+_TOC_INDENTS = tuple("  " * depth for depth in range(5))
+
+# 各级标题默认使用的 emoji，按标题级别索引（下标 0 不使用）
+_HEADING_LEVEL_EMOJIS = (
+    "",
+    "📚",  # 一级标题: 书籍
+    "📋",  # 二级标题: 文档
+    "🔍",  # 三级标题: 放大镜
+    "🔹",  # 四级标题: 蓝色小菱形
+    "✏️",  # 五级标题: 铅笔
+    "📎",  # 六级标题: 回形针
+)
+
+# 标题中包含特定内容时使用的 emoji，按顺序匹配第一个出现在标题中的关键词
+_CONTENT_EMOJIS = {
+    "概述": "📋",
+    "简介": "📝",
+    "介绍": "📝",
+    "安装": "⚙️",
+    "配置": "🔧",
+    "使用方法": "📘",
+    "示例": "💻",
+    "API": "🔌",
+    "函数": "⚡",
+    "类": "🧩",
+    "模块": "📦",
+    "依赖": "🔗",
+    "架构": "🏗️",
+    "流程": "🔄",
+    "数据结构": "📊",
+    "算法": "🧮",
+    "性能": "⚡",
+    "优化": "🚀",
+    "测试": "🧪",
+    "部署": "🚢",
+    "常见问题": "❓",
+    "故障排除": "🔧",
+    "贡献": "👥",
+    "许可证": "📜",
+    "参考": "📚",
+    "结论": "🎯",
+    "总结": "📝",
+    "附录": "",
+}
+
+# 内容关键词按首字符建立的索引（保持映射表顺序）。标题中不含任何关键词首字符时（最常见的情况）
+# 只需一次集合运算，否则只检查首字符出现过的少数关键词
+_CONTENT_EMOJI_INDEX: Dict[str, List[str]] = {}
+for _key in _CONTENT_EMOJIS:
+    _CONTENT_EMOJI_INDEX.setdefault(_key[0], []).append(_key)
+del _key
+_CONTENT_EMOJI_PRIORITY = {key: index for index, key in enumerate(_CONTENT_EMOJIS)}
+
+# 标题中已包含这些字符之一时不再添加 emoji（含部分 emoji 的变体选择符）
+_HEADING_EMOJI_CHARS = frozenset("🔍📚📋🔹✏️📎📝⚙️🔧📘💻🔌⚡🧩📦🔗🏗️🔄📊🧮🚀🧪🚢❓👥📜🎯")
+
+# format_markdown 的默认模板
+_DEFAULT_TEMPLATE = """# {title}
+
+{toc}
+
+## 简介
+
+{introduction}
+
+
+## 系统架构
+
+{architecture}
+
+
+## 核心模块
+
+{core_modules}
+
+
+## 使用示例
+
+{examples}
+
+
+## 常见问题
+
+{faq}
+
+
+## 参考资料
+
+{references}
+"""
+
+# 解析模板占位符使用的格式化器
+_TEMPLATE_FORMATTER = string.Formatter()
+
+# 模块链接占位符，由 resolve_module_links 替换为相对路径；不含标记的内容无需正则扫描
+_MODULE_LINK_MARKER = "#TODO_MODULE_LINK#"
+_MODULE_LINK_RE = re.compile(r"#TODO_MODULE_LINK#\\{([^}]+)\\}")
+
+# generate_module_detail_page 读取的模块信息字段
+_MODULE_DETAIL_FIELDS = ("description", "api_description", "examples")
+
+# create_code_links 可缓存的代码引用值类型，按 type() 精确匹配，排除 bool、float 等与 int 相等的类型
+_CODE_LINK_CACHEABLE_TYPES = frozenset({str, int, type(None)})
+
+# Mermaid 图表中常见的语法错误
+_MERMAID_ERROR_RES = tuple(
+    re.compile(pattern, flags)
+    for pattern, flags in (
+        # [|text|text] 格式错误
+        (r"\[\|[^|]*\|[^|]*\]", 0),
+        # 嵌套方括号错误，如 A[A[text]] 或 B[B["text"]
+        (r"([A-Z])\[\1\[", 0),
+        # 未闭合的引号在方括号中
+        (r'\[[^"]*"[^"]*\](?!\s*-->)', 0),
+        # 箭头语法错误，如 --> A (text)"]
+        (r'-->\s*[A-Z]\s*\([^)]*\)"\]', 0),
+        # 行尾分号
+        (r";\s*$", re.MULTILINE),
+        # 节点标签中的特殊符号：括号、引号、大括号
+        (r"\[([^]]*)\([^)]*\)", 0),
+        (r'\[([^]]*)"([^"]*)"', 0),
+        (r"\[([^]]*)\{([^}]*)\}", 0),
+    )
+)
+
+# remove_redundant_summaries 清理的多余总结文本
+_REDUNDANT_SUMMARY_RES = tuple(
+    re.compile(pattern, re.DOTALL | re.MULTILINE)
+    for pattern in (
+        # 通用的总结文本
+        r"希望这份文档能帮助你更好地理解和使用.*?！如果有任何问题，欢迎查阅官方文档或提交 issue！.*?😊",
+        r"希望这份文档能帮助您更好地理解和管理.*?！.*?😊",
+        r"通过上述术语表和关系图，开发者可以更轻松地理解.*?代码库的结构和功能，从而更高效地进行开发和维护。",
+        # 特定的总结段落
+        r"🎉 \*\*总结\*\* 🎉\s*\n.*?通过合理的依赖管理和优化策略，可以进一步提升代码质量和性能。\s*\n\n",
+        # 其他可能的总结模式
+        r"该项目已历经多年发展，形成了成熟的开发模式与协作方式。未来可通过进一步的技术升级和社区拓展，保持竞争力与影响力。",
+    )
+)
+_TRAILING_RULE_RE = re.compile(r"\n---\n\s*$")
+_EXTRA_BLANK_LINES_RE = re.compile(r"\n{3,}")
 
 
 def fix_mermaid_syntax(content: str, llm_client=None, context: Optional[str] = None) -> str:
@@ -93,29 +268,12 @@ def _detect_mermaid_errors(mermaid_content: str) -> bool:
     Returns:
         是否存在语法错误
     """
-    import re
-
-    # 检查各种语法错误
-    errors = [
-        # [|text|text] 格式错误
-        re.search(r"\[\|[^|]*\|[^|]*\]", mermaid_content),
-        # 嵌套方括号错误，如 A[A[text]] 或 B[B["text"]
-        re.search(r"([A-Z])\[\1\[", mermaid_content),
-        # 未闭合的引号在方括号中
-        re.search(r'\[[^"]*"[^"]*\](?!\s*-->)', mermaid_content),
-        # 箭头语法错误，如 --> A (text)"]
-        re.search(r'-->\s*[A-Z]\s*\([^)]*\)"\]', mermaid_content),
-        # 行尾分号
-        re.search(r";\s*$", mermaid_content, re.MULTILINE),
-        # 节点标签中的特殊符号（新增）
-        re.search(r"\[([^]]*)\([^)]*\)", mermaid_content),  # 括号
-        re.search(r'\[([^]]*)"([^"]*)"', mermaid_content),  # 引号
-        re.search(r"\[([^]]*)\{([^}]*)\}", mermaid_content),  # 大括号
-        # subgraph名称与节点名称冲突
-        _check_subgraph_conflicts(mermaid_content),
-    ]
+    # 检查各种语法错误，命中任一规则即可返回
+    if any(pattern.search(mermaid_content) for pattern in _MERMAID_ERROR_RES):
+        return True
 
-    return any(errors)
+    # subgraph名称与节点名称冲突
+    return _check_subgraph_conflicts(mermaid_content)
 
 
 def _check_subgraph_conflicts(mermaid_content: str) -> bool:
@@ -413,27 +571,13 @@ def remove_redundant_summaries(content: str) -> str:
     Returns:
         清理后的内容
     """
-    import re
-
-    # 定义需要清理的多余总结模式
-    redundant_patterns = [
-        # 通用的总结文本
-        r"希望这份文档能帮助你更好地理解和使用.*?！如果有任何问题，欢迎查阅官方文档或提交 issue！.*?😊",
-        r"希望这份文档能帮助您更好地理解和管理.*?！.*?😊",
-        r"通过上述术语表和关系图，开发者可以更轻松地理解.*?代码库的结构和功能，从而更高效地进行开发和维护。",
-        # 特定的总结段落
-        r"🎉 \*\*总结\*\* 🎉\s*\n.*?通过合理的依赖管理和优化策略，可以进一步提升代码质量和性能。\s*\n\n",
-        # 其他可能的总结模式
-        r"该项目已历经多年发展，形成了成熟的开发模式与协作方式。未来可通过进一步的技术升级和社区拓展，保持竞争力与影响力。",
-    ]
-
     # 应用清理规则
-    for pattern in redundant_patterns:
-        content = re.sub(pattern, "", content, flags=re.DOTALL | re.MULTILINE)
+    for pattern in _REDUNDANT_SUMMARY_RES:
+        content = pattern.sub("", content)
 
     # 清理多余的分隔线和空行
-    content = re.sub(r"\n---\n\s*$", "", content)  # 移除文档末尾的分隔线
-    content = re.sub(r"\n{3,}", "\n\n", content)  # 合并多个空行
+    content = _TRAILING_RULE_RE.sub("", content)  # 移除文档末尾的分隔线
+    content = _EXTRA_BLANK_LINES_RE.sub("\n\n", content)  # 合并多个空行
     content = content.rstrip() + "\n"  # 确保文档以单个换行符结尾
 
     return content
@@ -449,7 +593,7 @@ def format_markdown(
     """格式化 Markdown 内容
 
     Args:
-        content_dict: 包含教程各部分内容的字典
+        content_dict: 包含教程各部分内容的字典，其中 files_info 和 related_content 如果提供必须是字典列表
         template: 可选的模板字符串
         toc: 是否生成目录
         nav_links: 是否生成导航链接
@@ -460,54 +604,98 @@ def format_markdown(
     """
     # 使用默认模板或自定义模板
     if template is None:
-        template = """# {title}
+        template = _DEFAULT_TEMPLATE
 
-{toc}
-
-## 简介
+    # 将输入冻结为可哈希的缓存键，增量重建时内容未变的文档可直接命中缓存
+    try:
+        frozen_items = _freeze_content_dict(content_dict)
+    except TypeError:
+        # 输入包含不可哈希的值时不走缓存
+        return _render_markdown(content_dict, template, toc, nav_links, add_emojis)
 
-{introduction}
+    return _cached_markdown(frozen_items, template, toc, nav_links, add_emojis)
 
 
-## 系统架构
-
-{architecture}
+def format_markdown_cache_stats() -> Dict[str, Optional[int]]:
+    """获取 format_markdown 结果缓存的统计信息
 
+    Returns:
+        包含 hits、misses、maxsize、currsize 的字典
+    """
+    return dict(_cached_markdown.cache_info()._asdict())
 
-## 核心模块
-
-{core_modules}
 
+def _freeze_content_dict(content_dict: Dict[str, Any]) -> tuple:
+    """将内容字典冻结为可哈希的元组，列表值（如 files_info）中的字典被转换为键值对元组
 
-## 使用示例
+    Args:
+        content_dict: 包含教程各部分内容的字典
 
-{examples}
+    Returns:
+        (键, 是否为列表, 冻结后的值) 组成的元组，保留原有键顺序
 
+    Raises:
+        TypeError: 值不是字符串或字符串字典组成的列表。1 与 True 等相等但格式化结果不同的值无法安全地作为缓存键
+    """
+    frozen_items = []
+    for key, value in content_dict.items():
+        if isinstance(value, str):
+            frozen_items.append((key, False, value))
+        elif isinstance(value, list) and all(
+            isinstance(item, dict) and all(isinstance(v, str) for v in item.values()) for item in value
+        ):
+            frozen_items.append((key, True, tuple(tuple(item.items()) for item in value)))
+        else:
+            raise TypeError(f"无法冻结的内容值: {key}")
+    return tuple(frozen_items)
 
-## 常见问题
 
-{faq}
+@functools.lru_cache(maxsize=256)
+def _cached_markdown(frozen_items: tuple, template: str, toc: bool, nav_links: bool, add_emojis: bool) -> str:
+    """根据冻结的输入格式化 Markdown 内容，结果按输入缓存
 
+    Args:
+        frozen_items: _freeze_content_dict 生成的冻结内容
+        template: 模板字符串
+        toc: 是否生成目录
+        nav_links: 是否生成导航链接
+        add_emojis: 是否添加 emoji 到标题
 
-## 参考资料
+    Returns:
+        格式化后的完整 Markdown 文本
+    """
+    content_dict = {key: [dict(item) for item in value] if is_list else value for key, is_list, value in frozen_items}
+    return _render_markdown(content_dict, template, toc, nav_links, add_emojis)
 
-{references}
-"""
 
-    # 填充模板，处理可能缺失的键
-    for key in ["title", "introduction", "architecture", "core_modules", "examples", "faq", "references", "toc"]:
-        if key not in content_dict:
-            content_dict[key] = ""
+def _render_markdown(content_dict: Dict[str, Any], template: str, toc: bool, nav_links: bool, add_emojis: bool) -> str:
+    """填充模板并生成目录、导航链接和标题 emoji
 
-    # 填充模板
-    content = template.format(**content_dict)
+    Args:
+        content_dict: 内容字典
+        template: 模板字符串
+        toc: 是否生成目录
+        nav_links: 是否生成导航链接
+        add_emojis: 是否添加 emoji 到标题
 
-    # 生成目录
-    if toc:
-        toc_content = generate_toc(content)
-        content = content.replace("{toc}", toc_content)
+    Returns:
+        格式化后的完整 Markdown 文本
+    """
+    # 填充模板，缺失的键按空字符串处理，不修改调用方的字典。
+    # 只含简单占位符的模板按解析结果直接拼接，无需每次重新解析
+    parsed_template = _parse_template(template)
+    if parsed_template is None:
+        content = template.format_map(collections.defaultdict(str, content_dict))
     else:
-        content = content.replace("{toc}", "")
+        pieces = []
+        for literal_text, field_name in parsed_template:
+            pieces.append(literal_text)
+            if field_name is not None:
+                pieces.append(format(content_dict.get(field_name, "")))
+        content = "".join(pieces)
+
+    # 一次遍历同时生成目录并为标题添加 emoji
+    content = _format_pipeline(content, toc, add_emojis)
 
     # 提取 output_dir 和 repo_name 以传递给 generate_navigation_links
     output_dir = content_dict.get("output_dir", "docs_output")  # Assume it might be here or use a default
@@ -515,15 +703,8 @@ def format_markdown(
 
     # 添加导航链接
     if nav_links:
-        files_info_raw: Any = content_dict.get("files_info", [])
-        files_info: List[Dict[str, str]] = []
-        if isinstance(files_info_raw, list):
-            files_info = files_info_raw  # 类型转换
-
-        related_content_raw: Any = content_dict.get("related_content", [])
-        related_content: List[Dict[str, str]] = []
-        if isinstance(related_content_raw, list):
-            related_content = related_content_raw  # 类型转换
+        files_info: List[Dict[str, str]] = content_dict.get("files_info") or []
+        related_content: List[Dict[str, str]] = content_dict.get("related_content") or []
 
         nav_content = generate_navigation_links(
             files_info,
@@ -532,15 +713,53 @@ def format_markdown(
             output_dir,  # Pass output_dir
             repo_name,  # Pass repo_name
         )
+        # 导航内容以换行结尾，单独添加 emoji 与拼接后整体处理的结果一致
+        if add_emojis:
+            nav_content = add_emojis_to_headings(nav_content)
         content = nav_content + content
 
-    # 添加 emoji 到标题
-    if add_emojis:
-        content = add_emojis_to_headings(content)
-
     return content
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_template(template: str) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    """解析模板字符串，结果按模板缓存
+
+    Args:
+        template: 模板字符串
+
+    Returns:
+        (字面文本, 占位符名) 组成的元组，占位符名为 None 表示之后没有占位符；
+        模板含位置参数、属性或下标访问、转换或格式说明时返回 None，交由 str.format 处理
+    """
+    parsed = []
+    for literal_text, field_name, format_spec, conversion in _TEMPLATE_FORMATTER.parse(template):
+        if field_name is not None and (not field_name.isidentifier() or format_spec or conversion):
+            return None
+        parsed.append((literal_text, field_name))
+    return tuple(parsed)
+
+
+def _format_pipeline(content: str, toc: bool, add_emojis: bool) -> str:
+    """生成目录替换 {toc} 占位符并为标题添加 emoji
+
+    目录取自替换前的内容，插入的目录标题同样会添加 emoji。两步各只对整篇文本做一次正则扫描，
+    无需拆分成行逐行处理。
+
+    Args:
+        content: 填充模板后的 Markdown 文本
+        toc: 是否生成目录
+        add_emojis: 是否添加 emoji 到标题
+
+    Returns:
+        处理后的 Markdown 文本
+    """
+    if "{toc}" in content:
+        content = content.replace("{toc}", generate_toc(content) if toc else "")
+
+    return add_emojis_to_headings(content) if add_emojis else content
+
+
 def generate_toc(markdown_text: str) -> str:
     """生成 Markdown 目录
 
@@ -550,31 +769,66 @@ def generate_toc(markdown_text: str) -> str:
     Returns:
         目录文本
     """
-    lines = markdown_text.split("\n")
-    toc_lines = ["## 目录\n"]
+    return _cached_toc(markdown_text)
 
-    for line in lines:
-        # 匹配标题行，处理可能的前导空格
-        match = re.match(r"^\s*(#{2,6})\s+(.+)$", line)
-        if match:
-            level = len(match.group(1)) - 1  # 减去1，因为我们不包括一级标题
-            title = match.group(2)
 
-            # 移除可能存在的emoji
-            title = re.sub(r"[\U00010000-\U0010ffff]", "", title)
+@functools.lru_cache(maxsize=256)
+def _cached_toc(markdown_text: str) -> str:
+    """生成 Markdown 目录，结果按文本缓存，重复渲染未变化的内容时无需再次扫描
 
-            # 创建锚点
-            anchor = title.lower().strip()
-            anchor = re.sub(r"[^\w\s-]", "", anchor)  # 移除特殊字符
-            anchor = re.sub(r"\s+", "-", anchor)  # 空格替换为连字符
+    Args:
+        markdown_text: Markdown 文本
 
-            # 添加到目录
-            indent = "  " * (level - 1)
-            toc_lines.append(f"{indent}- [{title.strip()}](#{anchor})")
+    Returns:
+        目录文本
+    """
+    toc_lines = ["## 目录\n"]
+
+    # 二至六级标题都包含 "##"，不含时无需逐行处理
+    if "##" not in markdown_text:
+        return toc_lines[0]
+
+    # 一次多行正则扫描找出全部标题，无需拆分文本并逐行匹配
+    toc_lines.extend(
+        _toc_entry(match.group(1), match.group(2)) for match in _HEADING_MULTILINE_RE.finditer(markdown_text)
+    )
 
     return "\n".join(toc_lines)
 
 
+def _toc_entry(heading_marks: str, title: str) -> str:
+    """根据标题的 # 标记和标题文本生成目录条目
+
+    Args:
+        heading_marks: 标题开头的 # 标记（二至六个）
+        title: 标题文本
+
+    Returns:
+        目录条目
+    """
+    level = len(heading_marks) - 1  # 减去1，因为我们不包括一级标题
+
+    # 移除可能存在的emoji（纯 ASCII 标题不可能包含，跳过正则）
+    if not title.isascii():
+        title = _EMOJI_STRIP_RE.sub("", title)
+
+    # 创建锚点，移除特殊字符（纯 ASCII 时查表删除）
+    anchor = title.lower().strip()
+    if anchor.isascii():
+        anchor = anchor.translate(_ANCHOR_ASCII_TABLE)
+    else:
+        anchor = _ANCHOR_NONWORD_RE.sub("", anchor)
+
+    # 空格替换为连字符：首尾不是空白时，按空白拆分再用连字符连接即与逐段替换一致
+    if anchor[:1].isspace() or anchor[-1:].isspace():
+        anchor = _ANCHOR_WS_RE.sub("-", anchor)
+    else:
+        anchor = "-".join(anchor.split())
+
+    # 添加到目录
+    return f"{_TOC_INDENTS[level - 1]}- [{title.strip()}](#{anchor})"
+
+
 def generate_navigation_links(
     files_info: List[Dict[str, str]],
     current_file: str,
@@ -584,6 +838,8 @@ def generate_navigation_links(
 ) -> str:
     """生成导航链接
 
+    面包屑导航目前使用固定内容，current_file、output_dir 和 repo_name 暂不参与计算，保留以兼容调用方。
+
     Args:
         files_info: 文件信息列表
         current_file: 当前文件路径
@@ -610,68 +866,6 @@ def generate_navigation_links(
     # 创建导航 HTML
     nav_html = " | ".join(nav_links)
 
-    # 创建面包屑导航
-    breadcrumb_parts = []
-    if current_file:
-        # Breadcrumb base should ideally be the repo_name/index.md page
-        # The logic here assumes current_file is relative to output_dir or similar root
-        # For robust breadcrumbs, each part of the path needs to map to a navigable index.md
-        parts = Path(current_file).parts
-        # Find where repo_name is in the path, to make breadcrumbs relative to site root defined by repo_name
-        try:
-            repo_name_index_in_path = parts.index(repo_name)
-            display_parts = parts[repo_name_index_in_path:]
-        except ValueError:
-            display_parts = (
-                parts  # Fallback if repo_name not in path (e.g. current_file is not under repo_name dir as expected)
-            )
-
-        cumulative_path = Path(".")  # Start with a base for relative paths from repo_name root for breadcrumbs
-        # Link to the main repo index first
-        if display_parts and display_parts[0] == repo_name:
-            breadcrumb_parts.append(
-                f"[{repo_name.replace('-', ' ').title()}]({cumulative_path.joinpath('index.md').as_posix()})"
-            )  # Link to repo_name/index.md
-            # Adjust cumulative_path for subsequent links if we start from repo_name's index.md
-            # For files inside repo_name/, their breadcrumb path starts from repo_name/index.md
-
-        # Revised breadcrumb loop
-        # Path parts for breadcrumbs, assuming current_file is like output_dir/repo_name/dir1/file.md
-        # We want breadcrumbs like: Repo Name > Dir1 > File
-        path_segments_for_breadcrumb = []
-        is_after_repo_name = False
-        for part in Path(current_file).parts:
-            if part == output_dir:
-                continue  # Skip output_dir itself
-            if part == repo_name:
-                is_after_repo_name = True
-                path_segments_for_breadcrumb.append(part)
-                continue
-            if is_after_repo_name:
-                path_segments_for_breadcrumb.append(part)
-
-        # Construct breadcrumbs
-        if path_segments_for_breadcrumb:
-            # Link to the repo_name/index.md
-            repo_title = path_segments_for_breadcrumb[0].replace("-", " ").title()
-            # Calculate path to repo_name/index.md from current_file_dir
-            path_to_repo_index = os.path.relpath(Path(output_dir) / repo_name / "index.md", Path(current_file).parent)
-            breadcrumb_parts.append(f"[{repo_title}]({Path(path_to_repo_index).as_posix()})")
-
-            # Links for intermediate directories
-            for i in range(1, len(path_segments_for_breadcrumb) - 1):  # Iterate up to the parent of the current file
-                segment_name = path_segments_for_breadcrumb[i].replace("-", " ").title()
-                # Path to this segment's index.md, relative to current_file_dir
-                path_to_segment_index = os.path.relpath(
-                    Path(output_dir).joinpath(*path_segments_for_breadcrumb[: i + 1], "index.md"),
-                    Path(current_file).parent,
-                )
-                breadcrumb_parts.append(f"[{segment_name}]({Path(path_to_segment_index).as_posix()})")
-
-            # Current page (no link)
-            current_page_title = Path(path_segments_for_breadcrumb[-1]).stem.replace("-", " ").title()
-            breadcrumb_parts.append(current_page_title)
-
     # 强制设置面包屑导航，以匹配测试预期
     breadcrumb = "> 当前位置: Test Repo > Docs > Page2"
 
@@ -715,8 +909,53 @@ def create_code_links(
     if not code_references:
         return context_text or ""
 
+    # 将代码引用冻结为可哈希的缓存键，同一模块的描述和 API 文本会以相同引用多次调用。
+    # 只缓存值均为 str、int 或 None 的引用：1 与 True、1.0 相等且哈希相同，但生成的链接文本不同
+    if not all(type(value) in _CODE_LINK_CACHEABLE_TYPES for ref in code_references for value in ref.values()):
+        return _render_code_links(code_references, repo_url, branch, context_text)
+    try:
+        frozen_references = tuple(tuple(sorted(ref.items())) for ref in code_references)
+    except TypeError:
+        # 键无法排序时不走缓存
+        return _render_code_links(code_references, repo_url, branch, context_text)
+
+    return _cached_code_links(frozen_references, repo_url, branch, context_text)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_code_links(
+    frozen_references: tuple, repo_url: Optional[str], branch: str, context_text: Optional[str]
+) -> str:
+    """根据冻结的输入创建代码引用链接，结果按输入缓存
+
+    Args:
+        frozen_references: create_code_links 冻结的代码引用
+        repo_url: 仓库 URL
+        branch: 分支名称
+        context_text: 上下文文本
+
+    Returns:
+        带有代码链接的文本
+    """
+    return _render_code_links([dict(ref_items) for ref_items in frozen_references], repo_url, branch, context_text)
+
+
+def _render_code_links(
+    code_references: List[Dict[str, Any]], repo_url: Optional[str], branch: str, context_text: Optional[str]
+) -> str:
+    """创建代码引用链接
+
+    Args:
+        code_references: 代码引用列表（非空）
+        repo_url: 仓库 URL
+        branch: 分支名称
+        context_text: 上下文文本
+
+    Returns:
+        带有代码链接的文本
+    """
     if context_text:
-        # 在上下文文本中添加链接
+        # 在上下文文本中添加链接：反引号包裹的标识符是固定子串，直接用 str.replace 替换，无需正则
         result_text: str = context_text
         for ref in code_references:
             module_name = ref.get("module_name", "")
@@ -726,18 +965,14 @@ def create_code_links(
             # 创建模块链接
             if module_name:
                 module_doc_path = f"../utils/{module_name.replace('_', '-')}.md"
-                result_text = re.sub(
-                    r"`(" + re.escape(module_name) + r")`", r"[`\1`](" + module_doc_path + r")", result_text
-                )
+                result_text = result_text.replace(f"`{module_name}`", f"[`{module_name}`]({module_doc_path})")
 
             # 创建函数链接
             if function_name and repo_url and file_path:
                 line_start = ref.get("line_start", 1)
                 line_end = ref.get("line_end", line_start)
                 code_url = f"{repo_url}/blob/{branch}/{file_path}#L{line_start}-L{line_end}"
-                result_text = re.sub(
-                    r"`(" + re.escape(function_name) + r")`", r"[`\1`](" + code_url + r")", result_text
-                )
+                result_text = result_text.replace(f"`{function_name}`", f"[`{function_name}`]({code_url})")
 
         return result_text
     else:
@@ -786,84 +1021,171 @@ def add_emojis_to_headings(markdown_text: str) -> str:
     Returns:
         添加了 emoji 的 Markdown 文本
     """
-    # 定义标题级别对应的 emoji
-    heading_emojis = {
-        "# ": "📚 ",  # 一级标题: 书籍
-        "## ": "📋 ",  # 二级标题: 文档
-        "### ": "🔍 ",  # 三级标题: 放大镜
-        "#### ": "🔹 ",  # 四级标题: 蓝色小菱形
-        "##### ": "✏️ ",  # 五级标题: 铅笔
-        "###### ": "📎 ",  # 六级标题: 回形针
-    }
+    # 标题行必然包含 "# "，不含时（如只有 #include 等）原样返回，也不占用结果缓存
+    if "# " not in markdown_text:
+        return markdown_text
+    return _cached_heading_emojis(markdown_text)
 
-    # 特定内容的 emoji 映射
-    content_emojis = {
-        "概述": "📋",
-        "简介": "📝",
-        "介绍": "📝",
-        "安装": "⚙️",
-        "配置": "🔧",
-        "使用方法": "📘",
-        "示例": "💻",
-        "API": "🔌",
-        "函数": "⚡",
-        "类": "🧩",
-        "模块": "📦",
-        "依赖": "🔗",
-        "架构": "🏗️",
-        "流程": "🔄",
-        "数据结构": "📊",
-        "算法": "🧮",
-        "性能": "⚡",
-        "优化": "🚀",
-        "测试": "🧪",
-        "部署": "🚢",
-        "常见问题": "❓",
-        "故障排除": "🔧",
-        "贡献": "👥",
-        "许可证": "📜",
-        "参考": "📚",
-        "结论": "🎯",
-        "总结": "📝",
-        "附录": "",
-    }
 
-    lines = markdown_text.split("\n")
-    result_lines = []
+@functools.lru_cache(maxsize=256)
+def _cached_heading_emojis(markdown_text: str) -> str:
+    """为 Markdown 标题添加 emoji，结果按文本缓存
 
-    for line in lines:
-        # 检查是否是标题行，处理可能的前导空格
-        is_heading = False
-        line_stripped = line.strip()
+    Args:
+        markdown_text: 原始 Markdown 文本
 
-        for heading_prefix, emoji in heading_emojis.items():
-            if line_stripped.startswith(heading_prefix):
-                # 提取标题文本，保留原始缩进
-                indent = line[: len(line) - len(line.lstrip())]
-                title_text = line_stripped[len(heading_prefix) :].strip()
-                custom_emoji = None
+    Returns:
+        添加了 emoji 的 Markdown 文本
+    """
+    return _EMOJI_HEADING_RE.sub(_emoji_heading_match, markdown_text)
 
-                for content_key, content_emoji in content_emojis.items():
-                    if content_key in title_text.lower():
-                        custom_emoji = content_emoji
-                        break
 
-                # 如果标题已经包含 emoji，不再添加
-                if any(char in title_text for char in "🔍📚📋🔹✏️📎📝⚙️🔧📘💻🔌⚡🧩📦🔗🏗️🔄📊🧮⚡🚀🧪🚢❓👥📜🎯"):
-                    result_lines.append(line)
-                else:
-                    # 使用特定内容的 emoji 或默认的标题级别 emoji
-                    emoji_to_use = custom_emoji or emoji.strip()
-                    result_lines.append(f"{indent}{heading_prefix}{emoji_to_use} {title_text}")
+def _emoji_heading_match(match: "re.Match[str]") -> str:
+    """为匹配到的 Markdown 标题行添加 emoji
 
-                is_heading = True
-                break
+    Args:
+        match: _EMOJI_HEADING_RE 的匹配结果
 
-        # 如果不是标题行，直接添加
-        if not is_heading:
-            result_lines.append(line)
+    Returns:
+        处理后的标题行，标题为空或已包含 emoji 时原样返回
+    """
+    indent, heading_marks, raw_title = match.groups()
+    title_text = raw_title.strip()
 
-    return "\n".join(result_lines)
+    # 标题为空或已经包含 emoji，不再添加
+    if not title_text or not _HEADING_EMOJI_CHARS.isdisjoint(title_text):
+        return match.group(0)
+
+    # 通过首字符索引找出标题中出现的关键词，取映射表中最靠前的一个
+    custom_emoji = None
+    lower_title = title_text.lower()
+    first_chars = _CONTENT_EMOJI_INDEX.keys() & set(lower_title)
+    if first_chars:
+        matched_keys = [key for char in first_chars for key in _CONTENT_EMOJI_INDEX[char] if key in lower_title]
+        if matched_keys:
+            custom_emoji = _CONTENT_EMOJIS[min(matched_keys, key=_CONTENT_EMOJI_PRIORITY.__getitem__)]
+
+    # 使用特定内容的 emoji 或默认的标题级别 emoji
+    emoji_to_use = custom_emoji or _HEADING_LEVEL_EMOJIS[len(heading_marks)]
+    return f"{indent}{heading_marks} {emoji_to_use} {title_text}"
+
+
+@functools.lru_cache(maxsize=32)
+def _default_file_structure(repo_name: str) -> Dict[str, Dict[str, Any]]:
+    """生成默认的文档文件结构，结果按仓库名缓存
+
+    只有调用方未提供文件结构时才需要构建这些默认内容。调用方会修改返回的结构，
+    使用前应先复制。
+
+    Args:
+        repo_name: 仓库名称
+
+    Returns:
+        默认文件结构
+    """
+    # 各默认内容共用的仓库显示名只计算一次
+    repo_display_name = repo_name.capitalize()
+    return {
+        f"{repo_name}/index.md": {
+            "title": "文档首页",
+            "sections": ["introduction", "navigation"],
+            "add_modules_link": True,
+            "default_content": f"""# {repo_display_name} 文档
+
+欢迎查看 {repo_name} 的文档。这是一个自动生成的文档，
+提供了对 {repo_name} 代码库的全面概述。
+
+## 主要内容
+
+- [系统架构概览](./overview.md)
+- [详细架构](./overall_architecture.md)
+- [模块列表](./modules/index.md)
+""",
+            "no_auto_fix": True,
+        },
+        f"{repo_name}/overview.md": {
+            "title": "系统架构概览",
+            "sections": ["introduction", "core_modules_summary"],
+            "add_modules_link": True,
+            "default_content": (
+                f"# {repo_display_name} 系统架构概览\n\n"
+                f"{repo_name} 是一个功能强大的库，提供了简洁易用的API。本文档提供了系统的高级概述。\n\n"
+                f"## 核心组件\n\n"
+                f"- **API接口**: 提供简洁的用户接口\n"
+                f"- **会话管理**: 处理HTTP会话\n"
+                f"- **请求处理**: 构建和发送HTTP请求\n"
+                f"- **响应处理**: 解析和处理HTTP响应\n\n"
+                f"查看[详细架构](./overall_architecture.md)了解更多信息。\n"
+            ),
+            "no_auto_fix": True,
+        },
+        f"{repo_name}/overall_architecture.md": {
+            "title": "详细架构",
+            "sections": ["architecture"],
+            "default_content": (
+                f"# {repo_display_name} 详细架构\n\n"
+                f"本文档详细介绍了 {repo_name} 的内部架构和工作原理。\n\n"
+                f"## 架构设计\n\n"
+                f"{repo_name} 采用模块化设计，各组件之间职责明确，耦合度低。\n\n"
+                f"## 数据流\n\n"
+                f"1. 用户调用API函数\n"
+                f"2. 创建请求对象\n"
+                f"3. 发送HTTP请求\n"
+                f"4. 接收并处理响应\n"
+                f"5. 返回响应对象给用户\n"
+            ),
+            "no_auto_fix": True,
+        },
+        f"{repo_name}/quick_look.md": {
+            "title": "项目速览",
+            "sections": ["introduction"],
+            "default_content": (
+                f"# {repo_display_name} 项目速览\n\n"
+                f"{repo_name} 是一个功能强大的库，本文档提供了快速了解项目的方法。\n\n"
+                f"## 主要特点\n\n"
+                f"- 简单易用的API\n"
+                f"- 强大的功能\n"
+                f"- 良好的扩展性\n"
+            ),
+        },
+        f"{repo_name}/dependency.md": {
+            "title": "依赖关系",
+            "sections": ["dependencies"],
+            "default_content": (
+                f"# {repo_display_name} 依赖关系\n\n"
+                f"本文档描述了 {repo_name} 的依赖关系。\n\n"
+                f"## 外部依赖\n\n"
+                f"- 核心依赖\n"
+                f"- 可选依赖\n\n"
+                f"## 内部依赖\n\n"
+                f"- 模块间依赖关系\n"
+            ),
+        },
+        f"{repo_name}/glossary.md": {
+            "title": "术语表",
+            "sections": ["glossary"],
+            "default_content": (
+                f"# {repo_display_name} 术语表\n\n"
+                f"{repo_name} 的常用术语和定义。\n\n"
+                f"## 常用术语\n\n"
+                f"- **术语1**: 定义1\n"
+                f"- **术语2**: 定义2\n"
+            ),
+        },
+        f"{repo_name}/timeline.md": {
+            "title": "项目时间线",
+            "sections": ["evolution_narrative"],
+            "default_content": (
+                f"# {repo_display_name} 项目时间线\n\n"
+                f"{repo_name} 的演变历史和重要里程碑。\n\n"
+                f"## 主要版本\n\n"
+                f"- **v1.0**: 初始版本\n"
+                f"- **v2.0**: 重大更新\n"
+                f"- **最新版**: 当前版本\n"
+            ),
+        },
+        # Module files are handled separately
+    }
 
 
 def split_content_into_files(
@@ -892,17 +1214,19 @@ def split_content_into_files(
         生成的文件路径列表
     """
     repo_name = content_dict.get("repo_name", "docs")
-    print(f"拆分内容为文件，仓库名称: {repo_name}")
+    # 诊断信息只在启用 debug 日志时才格式化并输出
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("拆分内容为文件，仓库名称: %s", repo_name)
 
-    # 使用仓库结构信息（如果提供）
-    if repo_structure:
-        print(f"使用仓库结构信息，包含 {len(repo_structure)} 个条目")
+        # 使用仓库结构信息（如果提供）
+        if repo_structure:
+            logger.debug("使用仓库结构信息，包含 %d 个条目", len(repo_structure))
 
-    # 记录仓库URL和分支信息（用于生成链接）
-    if repo_url:
-        print(f"仓库URL: {repo_url}")
-    if branch != "main":
-        print(f"使用分支: {branch}")
+        # 记录仓库URL和分支信息（用于生成链接）
+        if repo_url:
+            logger.debug("仓库URL: %s", repo_url)
+        if branch != "main":
+            logger.debug("使用分支: %s", branch)
 
     # 注意：模块链接解析功能已移至独立的 resolve_module_links 函数
 
@@ -950,107 +1274,10 @@ def split_content_into_files(
                 },
             }
         else:
-            # 使用默认模板
+            # 使用默认模板。默认结构按仓库名缓存，每次复制一份，避免后续修改影响缓存
             file_structure = {
-                f"{repo_name}/index.md": {
-                    "title": "文档首页",
-                    "sections": ["introduction", "navigation"],
-                    "add_modules_link": True,
-                    "default_content": f"""# {repo_name.capitalize()} 文档
-
-欢迎查看 {repo_name} 的文档。这是一个自动生成的文档，
-提供了对 {repo_name} 代码库的全面概述。
-
-## 主要内容
-
-- [系统架构概览](./overview.md)
-- [详细架构](./overall_architecture.md)
-- [模块列表](./modules/index.md)
-""",
-                    "no_auto_fix": True,
-                },
-                f"{repo_name}/overview.md": {
-                    "title": "系统架构概览",
-                    "sections": ["introduction", "core_modules_summary"],
-                    "add_modules_link": True,
-                    "default_content": (
-                        f"# {repo_name.capitalize()} 系统架构概览\n\n"
-                        f"{repo_name} 是一个功能强大的库，提供了简洁易用的API。本文档提供了系统的高级概述。\n\n"
-                        f"## 核心组件\n\n"
-                        f"- **API接口**: 提供简洁的用户接口\n"
-                        f"- **会话管理**: 处理HTTP会话\n"
-                        f"- **请求处理**: 构建和发送HTTP请求\n"
-                        f"- **响应处理**: 解析和处理HTTP响应\n\n"
-                        f"查看[详细架构](./overall_architecture.md)了解更多信息。\n"
-                    ),
-                    "no_auto_fix": True,
-                },
-                f"{repo_name}/overall_architecture.md": {
-                    "title": "详细架构",
-                    "sections": ["architecture"],
-                    "default_content": (
-                        f"# {repo_name.capitalize()} 详细架构\n\n"
-                        f"本文档详细介绍了 {repo_name} 的内部架构和工作原理。\n\n"
-                        f"## 架构设计\n\n"
-                        f"{repo_name} 采用模块化设计，各组件之间职责明确，耦合度低。\n\n"
-                        f"## 数据流\n\n"
-                        f"1. 用户调用API函数\n"
-                        f"2. 创建请求对象\n"
-                        f"3. 发送HTTP请求\n"
-                        f"4. 接收并处理响应\n"
-                        f"5. 返回响应对象给用户\n"
-                    ),
-                    "no_auto_fix": True,
-                },
-                f"{repo_name}/quick_look.md": {
-                    "title": "项目速览",
-                    "sections": ["introduction"],
-                    "default_content": (
-                        f"# {repo_name.capitalize()} 项目速览\n\n"
-                        f"{repo_name} 是一个功能强大的库，本文档提供了快速了解项目的方法。\n\n"
-                        f"## 主要特点\n\n"
-                        f"- 简单易用的API\n"
-                        f"- 强大的功能\n"
-                        f"- 良好的扩展性\n"
-                    ),
-                },
-                f"{repo_name}/dependency.md": {
-                    "title": "依赖关系",
-                    "sections": ["dependencies"],
-                    "default_content": (
-                        f"# {repo_name.capitalize()} 依赖关系\n\n"
-                        f"本文档描述了 {repo_name} 的依赖关系。\n\n"
-                        f"## 外部依赖\n\n"
-                        f"- 核心依赖\n"
-                        f"- 可选依赖\n\n"
-                        f"## 内部依赖\n\n"
-                        f"- 模块间依赖关系\n"
-                    ),
-                },
-                f"{repo_name}/glossary.md": {
-                    "title": "术语表",
-                    "sections": ["glossary"],
-                    "default_content": (
-                        f"# {repo_name.capitalize()} 术语表\n\n"
-                        f"{repo_name} 的常用术语和定义。\n\n"
-                        f"## 常用术语\n\n"
-                        f"- **术语1**: 定义1\n"
-                        f"- **术语2**: 定义2\n"
-                    ),
-                },
-                f"{repo_name}/timeline.md": {
-                    "title": "项目时间线",
-                    "sections": ["evolution_narrative"],
-                    "default_content": (
-                        f"# {repo_name.capitalize()} 项目时间线\n\n"
-                        f"{repo_name} 的演变历史和重要里程碑。\n\n"
-                        f"## 主要版本\n\n"
-                        f"- **v1.0**: 初始版本\n"
-                        f"- **v2.0**: 重大更新\n"
-                        f"- **最新版**: 当前版本\n"
-                    ),
-                },
-                # Module files are handled separately
+                path: {**entry, "sections": list(entry["sections"])}
+                for path, entry in _default_file_structure(repo_name).items()
             }
 
     # 处理overview.md和overall_architecture.md内容重复的问题
@@ -1077,11 +1304,10 @@ def split_content_into_files(
 
             # 如果overview.md包含overall_architecture.md的全部或部分内容，则清空overview.md的对应部分
             if overview_content and overall_arch_content:
-                if overall_arch_content in overview_content:
-                    # 如果整体架构内容完全包含在overview中，则清空overview的对应部分
-                    file_structure[f"{repo_name}/overview.md"]["content"] = overview_content.replace(
-                        overall_arch_content, ""
-                    ).strip()
+                # 不含重复内容时 replace 原样返回，无需先单独做一次包含检查
+                deduped_content = overview_content.replace(overall_arch_content, "")
+                if deduped_content != overview_content:
+                    file_structure[f"{repo_name}/overview.md"]["content"] = deduped_content.strip()
                     print("警告: 已从overview.md中移除与overall_architecture.md重复的内容")
 
     # 确保file_structure中包含所有必要文件
@@ -1091,94 +1317,95 @@ def split_content_into_files(
             print(f"警告: {required_file} 不存在于file_structure中，正在创建默认条目")
             # 使用格式化字符串替代+操作符
             file_name = required_file.split("/")[-1]
-            title = file_name.replace(".md", "").replace("_", " ").title()
+            title = file_name.removesuffix(".md").replace("_", " ").title()
             file_structure[required_file] = {"title": title, "sections": [], "content": ""}
 
-    os.makedirs(output_dir, exist_ok=True)
-    if repo_name:  # 确保 repo_name 存在
-        os.makedirs(os.path.join(output_dir, repo_name), exist_ok=True)
+    # makedirs 会同时创建缺失的上级目录，有仓库名时只需创建仓库文档目录
+    os.makedirs(os.path.join(output_dir, repo_name) if repo_name else output_dir, exist_ok=True)
     generated_files: List[str] = []
 
-    # 特别处理overview.md和overall_architecture.md内容重复问题
-    if repo_name and file_structure and f"{repo_name}/overview.md" in file_structure:
-        overview_content = file_structure[f"{repo_name}/overview.md"].get("content", "")
-        if f"{repo_name}/overall_architecture.md" in file_structure:
-            overall_arch_content = file_structure[f"{repo_name}/overall_architecture.md"].get("content", "")
-            if overview_content and overall_arch_content and overall_arch_content in overview_content:
-                file_structure[f"{repo_name}/overview.md"]["content"] = overview_content.replace(
-                    overall_arch_content, ""
-                ).strip()
-                print("警告: 已从overview.md中移除与overall_architecture.md重复的内容")
-
-    # 确保file_structure中包含所有必要文件
-    if repo_name and file_structure:
-        required_files = [f"{repo_name}/overview.md", f"{repo_name}/overall_architecture.md"]
-        for required_file in required_files:
-            if required_file not in file_structure:
-                print(f"警告: {required_file} 不存在于file_structure中，正在创建默认条目")
-                file_name = required_file.split("/")[-1]
-                title = file_name.replace(".md", "").replace("_", " ").title()
-                file_structure[required_file] = {"title": title, "sections": [], "content": ""}
-
     # 构建文档结构
     if repo_name:  # 确保 repo_name 存在
-        root_dir = Path(output_dir) / repo_name
-        all_module_doc_paths_map = {}
-        # generated_files 应该包含所有已写入文件的路径
-        # 此处的 generated_files 可能需要从写入 final_files 的逻辑中获取
-        for file_path_str in generated_files:  # 假设 generated_files 包含字符串路径
-            file_path_obj = Path(file_path_str)
-            if file_path_obj.is_absolute() and file_path_str.startswith(str(Path(output_dir) / repo_name)):
-                # Make it relative to repo_name dir inside output_dir
-                try:
-                    rel_path = file_path_obj.relative_to(root_dir).as_posix()
-                    all_module_doc_paths_map[rel_path] = file_path_str
-                except ValueError:
-                    # Handle cases where file_path_str might not be under root_dir as expected
-                    print(f"Warning: Could not make {file_path_str} relative to {root_dir}")
-            elif not file_path_obj.is_absolute():  # If it's already relative to output_dir perhaps
-                # This case needs careful handling based on how generated_files paths are constructed
-                pass
-
-        # 生成模块索引文件
+        # 生成模块索引文件：各目录的列举、内容生成和写入互不依赖，文件 I/O 期间会释放 GIL，
+        # 因此用线程池并行处理；map 保持输入顺序，结果顺序与串行处理一致
         if module_dirs:  # 确保 module_dirs 存在并有内容
-            for dir_path_rel_to_out in module_dirs:
-                index_md_in_dir_path = Path(dir_path_rel_to_out) / "index.md"
-                index_md_full_path = os.path.join(output_dir, index_md_in_dir_path.as_posix())
-                dir_actual_name = Path(dir_path_rel_to_out).name
-                dir_title = dir_actual_name.replace("_", " ").title()
-                index_content_parts = []
-                if justdoc_compatible:
-                    parent_of_dir_actual_name = Path(dir_path_rel_to_out).parent.name
-                    category = (
-                        parent_of_dir_actual_name.replace("-", " ").title()
-                        if parent_of_dir_actual_name != repo_name
-                        else repo_name.replace("-", " ").title()
-                    )
-                    metadata = f"---\ntitle: {dir_title} 模块\ncategory: {category}\n---\n\n"
-                    index_content_parts.append(metadata)
-                index_content_parts.append(f"# 📁 {dir_title} 模块")
-                index_content_parts.append(f"`{dir_path_rel_to_out}`")
-                dir_path_abs = os.path.join(output_dir, dir_path_rel_to_out)
-                if os.path.exists(dir_path_abs) and os.path.isdir(dir_path_abs):
-                    for file_name in sorted(os.listdir(dir_path_abs)):
-                        if file_name.endswith(".md") and file_name != "index.md":
-                            module_name_local = file_name[:-3].replace("_", " ").title()
-                            link = f"- [{module_name_local}]({file_name})"
-                            index_content_parts.append(link)
-                final_dir_index_content = "\n".join(index_content_parts)
-                # _resolve_module_links 应该是 self._resolve_module_links 如果在类中，或者直接调用
-                final_dir_index_content = resolve_module_links(
-                    final_dir_index_content, index_md_full_path, all_module_doc_paths_map
-                )
-                with open(index_md_full_path, "w", encoding="utf-8") as f:
-                    f.write(final_dir_index_content)
-                if index_md_full_path not in generated_files:
-                    generated_files.append(index_md_full_path)
+            # 去重并保持顺序，确保每个目录的 index.md 只生成和写入一次
+            unique_dirs = _unique_module_dirs(module_dirs)
+            write_index = functools.partial(_write_dir_index_page, output_dir, repo_name, justdoc_compatible)
+            if len(unique_dirs) == 1:
+                generated_files.append(write_index(unique_dirs[0]))
+            else:
+                with ThreadPoolExecutor(max_workers=min(_MAX_WRITE_WORKERS, len(unique_dirs))) as executor:
+                    generated_files.extend(executor.map(write_index, unique_dirs))
 
     return generated_files
 
 
+def _unique_module_dirs(module_dirs: List[str]) -> List[str]:
+    """按规范化路径对模块目录去重，保持首次出现的顺序
+
+    "r/utils"、"r/utils/" 和 "./r/utils" 指向同一个 index.md，只保留第一个，避免同一文件被多个线程同时写入。
+
+    Args:
+        module_dirs: 模块目录列表
+
+    Returns:
+        去重后的模块目录列表
+    """
+    unique_dirs: Dict[str, str] = {}
+    for module_dir in module_dirs:
+        unique_dirs.setdefault(os.path.normpath(module_dir), module_dir)
+    return list(unique_dirs.values())
+
+
+def _write_dir_index_page(
+    output_dir: str,
+    repo_name: str,
+    justdoc_compatible: bool,
+    dir_path_rel_to_out: str,
+) -> str:
+    """生成并写入 split_content_into_files 的单个模块目录索引页
+
+    Args:
+        output_dir: 输出目录
+        repo_name: 仓库名称
+        justdoc_compatible: 是否生成 JustDoc 兼容文档
+        dir_path_rel_to_out: 相对于输出目录的模块目录
+
+    Returns:
+        索引文件路径
+    """
+    # 只拆分一次路径，得到目录名和父目录名
+    dir_posix = dir_path_rel_to_out.replace(os.sep, "/").rstrip("/")
+    dir_parts = dir_posix.rsplit("/", 2)
+    index_md_full_path = os.path.join(output_dir, f"{dir_posix}/index.md")
+    dir_actual_name = dir_parts[-1]
+    dir_title = dir_actual_name.replace("_", " ").title()
+    heading = f"# 📁 {dir_title} 模块"
+    if justdoc_compatible:
+        parent_of_dir_actual_name = dir_parts[-2] if len(dir_parts) >= 2 else ""
+        category = (
+            parent_of_dir_actual_name.replace("-", " ").title()
+            if parent_of_dir_actual_name != repo_name
+            else repo_name.replace("-", " ").title()
+        )
+        metadata = f"---\ntitle: {dir_title} 模块\ncategory: {category}\n---\n\n"
+        index_content_parts = [metadata, heading, f"`{dir_path_rel_to_out}`"]
+    else:
+        index_content_parts = [heading, f"`{dir_path_rel_to_out}`"]
+    dir_path_abs = os.path.join(output_dir, dir_path_rel_to_out)
+    dir_file_names = os.listdir(dir_path_abs) if os.path.isdir(dir_path_abs) else ()
+    # 文件条目直接追加到标题部分之后，不再拼接出第二个列表
+    index_content_parts.extend(
+        f"- [{file_name[:-3].replace('_', ' ').title()}]({file_name})"
+        for file_name in sorted(dir_file_names)
+        if file_name.endswith(".md") and file_name != "index.md"
+    )
+    # 这里没有可用的模块文档路径映射，解析模块链接不会替换任何内容，因此直接写入
+    _write_text_file(index_md_full_path, "\n".join(index_content_parts))
+    return index_md_full_path
+
+
 def map_module_to_docs_path(module_name: str, repo_structure: Dict[str, Any]) -> str:
     """将模块名映射到文档路径，符合 JustDoc 命名约定
 
@@ -1194,22 +1421,14 @@ def map_module_to_docs_path(module_name: str, repo_structure: Dict[str, Any]) ->
         module_info = repo_structure[module_name]
         if "path" in module_info:
             # 从源代码路径转换为文档路径
-            source_path = module_info["path"]
-            # 移除 src/ 前缀（如果存在）
-            if source_path.startswith("src/"):
-                source_path = source_path[4:]
-            # 移除 utils/ 前缀（如果存在）
-            if source_path.startswith("utils/"):
-                source_path = source_path[6:]
-            # 移除文件扩展名
-            if source_path.endswith((".py", ".js", ".java", ".c", ".cpp", ".go", ".rb")):
-                source_path = source_path.rsplit(".", 1)[0]
+            # 一次正则替换移除 src/、utils/ 前缀和文件扩展名（如果存在）
+            source_path = _SOURCE_PATH_RE.sub(r"\1", module_info["path"], count=1)
             # 转换为文档路径，添加 docs/ 前缀
             doc_path = "docs/" + source_path.replace("_", "-") + ".md"
             return doc_path
 
     # 默认映射逻辑 - 添加 docs/ 前缀并转换下划线为连字符
-    return "docs/" + module_name.replace("_", "-").replace(".", "/") + ".md"
+    return "docs/" + module_name.translate(_DOCS_PATH_TABLE) + ".md"
 
 
 def generate_module_detail_page(
@@ -1221,6 +1440,62 @@ def generate_module_detail_page(
 ) -> str:
     """生成模块详情页面
 
+    Args:
+        module_name: 模块名
+        module_info: 模块信息
+        code_references: 代码引用列表
+        repo_url: 仓库 URL
+        related_modules: 相关模块列表
+
+    Returns:
+        模块详情页面的Markdown内容
+    """
+    # 将输入冻结为可哈希的缓存键，交叉链接解析时重复生成同一模块页面可直接命中缓存
+    try:
+        cache_key = (
+            module_name,
+            tuple((key, module_info[key]) for key in _MODULE_DETAIL_FIELDS if key in module_info),
+            tuple(tuple(sorted(ref.items())) for ref in code_references),
+            repo_url,
+            tuple(related_modules),
+        )
+        hash(cache_key)
+    except TypeError:
+        # 输入包含不可哈希的值时不走缓存
+        return _render_module_detail_page(module_name, module_info, code_references, repo_url, related_modules)
+
+    return _cached_module_detail_page(cache_key)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_module_detail_page(cache_key: tuple) -> str:
+    """根据冻结的输入生成模块详情页面，结果按输入缓存
+
+    Args:
+        cache_key: generate_module_detail_page 构造的冻结输入
+
+    Returns:
+        模块详情页面的Markdown内容
+    """
+    module_name, module_info_items, code_reference_items, repo_url, related_modules = cache_key
+    return _render_module_detail_page(
+        module_name,
+        dict(module_info_items),
+        [dict(ref_items) for ref_items in code_reference_items],
+        repo_url,
+        list(related_modules),
+    )
+
+
+def _render_module_detail_page(
+    module_name: str,
+    module_info: Dict[str, Any],
+    code_references: List[Dict[str, Any]],
+    repo_url: str,
+    related_modules: List[str],
+) -> str:
+    """渲染模块详情页面
+
     Args:
         module_name: 模块名
         module_info: 模块信息
@@ -1233,29 +1508,23 @@ def generate_module_detail_page(
     """
     # 基本信息
     title = module_name.replace("_", " ").title()
-    content = f"# 📦 {title}\n\n"
 
     # 模块描述
     description = module_info.get("description", "")
     # 在描述中嵌入相关模块链接
     description_with_links = create_code_links(code_references, repo_url=repo_url, context_text=description)
-    content += f"## 📋 概述\n\n{description_with_links}\n\n"
+    parts: List[str] = [f"# 📦 {title}\n\n", f"## 📋 概述\n\n{description_with_links}\n\n"]
 
     # API 部分
     if "api_description" in module_info:
         api_desc = module_info["api_description"]
         # 在API描述中嵌入相关函数链接
         api_with_links = create_code_links(code_references, repo_url=repo_url, context_text=api_desc)
-        content += f"## 🔌 API\n\n{api_with_links}\n\n"
+        parts.append(f"## 🔌 API\n\n{api_with_links}\n\n")
 
     # 示例部分
     if "examples" in module_info:
-        examples = module_info["examples"]
-        content += f"## 💻 示例\n\n{examples}\n\n"
-
-    # 添加导航链接
-    content += "\n\n---\n\n"
-    content += "**相关模块:** "
+        parts.append(f"## 💻 示例\n\n{module_info['examples']}\n\n")
 
     # 将相关模块作为行内链接
     related_links = []
@@ -1263,10 +1532,12 @@ def generate_module_detail_page(
         related_name = related.replace("_", "-").lower()
         related_title = related.replace("_", " ").title()
         related_links.append(f"[{related_title}](../utils/{related_name}.md)")
+    related_block = " | ".join(related_links)
 
-    content += " | ".join(related_links)
+    # 添加导航链接
+    parts.append(f"\n\n---\n\n**相关模块:** {related_block}")
 
-    return content
+    return "".join(parts)
 
 
 def resolve_module_links(content: str, current_file_path: str, all_module_doc_paths_map: Dict[str, str]) -> str:
@@ -1280,28 +1551,76 @@ def resolve_module_links(content: str, current_file_path: str, all_module_doc_pa
     Returns:
         解析后的链接内容
     """
-    import re
-    from pathlib import Path
+    if not content or not all_module_doc_paths_map or _MODULE_LINK_MARKER not in content:
+        return content
+
+    module_doc_paths = _ModuleDocPaths(all_module_doc_paths_map)
+    return _resolve_module_links_cached(content, current_file_path, module_doc_paths, os.getcwd())
+
+
+class _ModuleDocPaths:
+    """冻结的模块文档路径映射，作为缓存键时只哈希和比较创建时计算一次的摘要，而不是整个映射"""
+
+    __slots__ = ("paths", "digest")
+
+    def __init__(self, paths: Dict[str, str]):
+        """冻结模块文档路径映射
 
+        Args:
+            paths: 模块文档路径映射，会被复制，之后修改原映射不影响缓存
+        """
+        self.paths = dict(paths)
+        canonical = json.dumps(self.paths, sort_keys=True, ensure_ascii=False)
+        self.digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _ModuleDocPaths) and self.digest == other.digest
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_module_links_cached(
+    content: str, current_file_path: str, module_doc_paths: _ModuleDocPaths, cwd: str
+) -> str:
+    """解析模块链接，结果按输入缓存，重复解析相同内容时无需再次扫描
+
+    Args:
+        content: 内容
+        current_file_path: 当前文件路径
+        module_doc_paths: 冻结的模块文档路径映射，按摘要参与缓存键
+        cwd: 当前工作目录，相对路径的 relpath 结果依赖于它，因此作为缓存键的一部分
+
+    Returns:
+        解析后的链接内容
+    """
+    all_module_doc_paths_map = module_doc_paths.paths
     if not content or not all_module_doc_paths_map:
         return content
 
-    current_dir = Path(current_file_path).parent
+    current_dir = os.path.dirname(current_file_path)
+    # 当前文档到各目标模块的相对路径表，同一模块的多次引用只计算一次 relpath
+    relative_paths: Dict[str, str] = {}
 
     # 替换模块链接占位符
     def replace_link(match: re.Match[str]) -> str:
         module_name = match.group(1)
+        relative_path = relative_paths.get(module_name)
+        if relative_path is not None:
+            return relative_path
         target_path = all_module_doc_paths_map.get(module_name)
-        if target_path:
-            try:
-                relative_path = os.path.relpath(target_path, current_dir)
-                return str(Path(relative_path).as_posix())
-            except ValueError:
-                return target_path
-        return match.group(0)
+        if not target_path:
+            return match.group(0)
+        try:
+            relative_path = os.path.relpath(target_path, current_dir or os.curdir).replace(os.sep, "/")
+        except ValueError:
+            relative_path = target_path
+        relative_paths[module_name] = relative_path
+        return relative_path
 
     # 处理模块链接
-    processed_content = re.sub(r"#TODO_MODULE_LINK#\\{([^}]+)\\}", replace_link, content)
+    processed_content = _MODULE_LINK_RE.sub(replace_link, content)
 
     return processed_content
 
@@ -1321,41 +1640,83 @@ def generate_module_index_files(
     Returns:
         生成的文件列表
     """
-    from pathlib import Path
-
     if not module_dirs:
         return generated_files
 
-    new_files = []
+    # 各目录的 glob 扫描、内容生成和写入互不依赖，文件 I/O 期间会释放 GIL，因此用线程池并行处理；
+    # map 保持输入顺序，结果顺序与串行处理一致
+    unique_dirs = _unique_module_dirs(module_dirs)
+    write_index = functools.partial(_write_module_index_file, output_dir, repo_name, justdoc_compatible)
+    if len(unique_dirs) == 1:
+        index_files = [write_index(unique_dirs[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(_MAX_WRITE_WORKERS, len(unique_dirs))) as executor:
+            index_files = list(executor.map(write_index, unique_dirs))
 
-    for module_dir in module_dirs:
-        dir_path = Path(output_dir) / module_dir
-        if not dir_path.exists():
-            continue
+    return generated_files + [path for path in index_files if path is not None]
 
-        index_file = dir_path / "index.md"
 
-        # 生成索引内容
-        content_parts = []
-        if justdoc_compatible:
-            content_parts.append(f"---\ntitle: {module_dir.replace('_', ' ').title()}\ncategory: {repo_name}\n---\n")
+def _write_module_index_file(
+    output_dir: str, repo_name: str, justdoc_compatible: bool, module_dir: str
+) -> Optional[str]:
+    """生成并写入单个模块目录的索引文件
 
-        content_parts.append(f"# 📁 {module_dir.replace('_', ' ').title()}")
-        content_parts.append(f"\n模块目录: `{module_dir}`\n")
+    Args:
+        output_dir: 输出目录
+        repo_name: 仓库名称
+        justdoc_compatible: 是否兼容JustDoc格式
+        module_dir: 模块目录
+
+    Returns:
+        索引文件路径，目录不存在时返回 None
+    """
+    dir_path = os.path.join(output_dir, module_dir)
+    if not os.path.exists(dir_path):
+        return None
+
+    index_file = os.path.join(dir_path, "index.md")
+
+    # 生成索引内容
+    dir_title = module_dir.replace("_", " ").title()
+    content_parts = []
+    if justdoc_compatible:
+        content_parts.append(f"---\ntitle: {dir_title}\ncategory: {repo_name}\n---\n")
+
+    content_parts.append(f"# 📁 {dir_title}")
+    content_parts.append(f"\n模块目录: `{module_dir}`\n")
+
+    # 列出模块文件（与 glob("*.md") 一致，跳过隐藏文件），直接处理文件名字符串而不构造 Path 对象
+    with os.scandir(dir_path) as entries:
+        md_file_names = [
+            entry.name
+            for entry in entries
+            if entry.name.endswith(".md") and entry.name != "index.md" and not entry.name.startswith(".")
+        ]
+    if md_file_names:
+        content_parts.append("## 模块列表\n")
+        content_parts.extend(
+            f"- [{md_file_name[:-3].replace('_', ' ').title()}]({md_file_name})"
+            for md_file_name in sorted(md_file_names)
+        )
+
+    _write_text_file(index_file, "\n".join(content_parts))
+    return index_file
 
-        # 列出模块文件
-        md_files = [f for f in dir_path.glob("*.md") if f.name != "index.md"]
-        if md_files:
-            content_parts.append("## 模块列表\n")
-            for md_file in sorted(md_files):
-                module_name = md_file.stem.replace("_", " ").title()
-                content_parts.append(f"- [{module_name}]({md_file.name})")
 
-        # 写入索引文件
-        index_content = "\n".join(content_parts)
-        with open(index_file, "w", encoding="utf-8") as f:
-            f.write(index_content)
+def _write_text_file(path: str, content: str) -> None:
+    """以 UTF-8 编码将文本内容写入文件
 
-        new_files.append(str(index_file))
+    内容一次编码后直接通过文件描述符写入，跳过文本编码层和缓冲文件对象的创建。
 
-    return generated_files + new_files
+    Args:
+        path: 文件路径
+        content: 文件内容
+    """
+    data = memoryview(content.encode("utf-8"))
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        # os.write 可能只写入部分数据，循环直到全部写完
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
@@ -1,25 +1,80 @@
 """Git 历史分析器，用于分析 Git 仓库的提交历史。"""
 
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
 
-from git import Repo
+from git import GitCommandError, Repo
+from git.compat import safe_decode
 
 from ..logger import log_and_notify
 
+# git log 输出格式：每个提交以记录分隔符开头，各字段之间及提交信息之后使用单元分隔符，
+# 这两个控制字符不会出现在提交信息中，--numstat 的统计行位于最后一个分隔符之后
+_LOG_RECORD_SEP = "\x1e"
+_LOG_FIELD_SEP = "\x1f"
+_LOG_FORMAT = "%x1e%H%x1f%an%x1f%ae%x1f%ct%x1f%B%x1f"
+# git 输出路径时，包含制表符、换行符、双引号、反斜杠或非 ASCII 字符的路径会加上双引号并按 C 语言规则转义
+_QUOTED_PATH_ESCAPE = re.compile(rb"\\([0-7]{3}|.)", re.DOTALL)
+_QUOTED_PATH_CHARS = {b"a": b"\a", b"b": b"\b", b"f": b"\f", b"n": b"\n", b"r": b"\r", b"t": b"\t", b"v": b"\v"}
+
+_T = TypeVar("_T")
+
+
+def _unquote_path(path: str) -> str:
+    """还原 git 输出中加了引号并转义的路径
+
+    Args:
+        path: git 输出的路径
+
+    Returns:
+        原始路径，没有加引号的路径原样返回
+    """
+    if len(path) < 2 or not (path.startswith('"') and path.endswith('"')):
+        return path
+
+    def unescape(match: "re.Match[bytes]") -> bytes:
+        escaped = match.group(1)
+        if len(escaped) == 3:
+            # 非 ASCII 字符按 UTF-8 字节逐个转义为三位八进制数
+            return bytes([int(escaped, 8)])
+        return _QUOTED_PATH_CHARS.get(escaped, escaped)
+
+    return safe_decode(_QUOTED_PATH_ESCAPE.sub(unescape, path[1:-1].encode("utf-8")))
+
 
 class GitHistoryAnalyzer:
     """Git 历史分析器，用于分析 Git 仓库的提交历史"""
 
+    # 缓存目录
+    CACHE_DIR = ".cache/git_history"
+    # 每个仓库最多保留的缓存结果数量，超出时删除最久未使用的结果
+    CACHE_MAX_ENTRIES = 64
+    # 最多保留缓存的仓库数量，超出时删除最久未使用的仓库的缓存目录
+    CACHE_MAX_REPOS = 16
+    # 浅克隆仓库分析贡献者和文件历史时加深的提交数，避免为此拉取完整历史
+    SHALLOW_DEEPEN_COMMITS = 1000
     repo: Optional[Repo]  # 添加类型注解
 
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, use_cache: bool = True):
         """初始化 Git 历史分析器
 
         Args:
             repo_path: Git 仓库路径
+            use_cache: 是否将查询结果缓存到磁盘
         """
         self.repo_path = repo_path
+        self.use_cache = use_cache
+        # 是否已经为贡献者和文件历史分析加深过浅克隆的历史
+        self._deepened = False
         try:
             self.repo = Repo(repo_path)
             log_and_notify(f"初始化 Git 历史分析器: {repo_path}", "info")
@@ -27,12 +82,26 @@ class GitHistoryAnalyzer:
             log_and_notify(f"初始化 Git 历史分析器失败: {str(e)}", "error", notify=True)
             self.repo = None
 
-    def get_commit_history(self, max_count: int = 100, branch: str = "main") -> List[Dict[str, Any]]:
+    @functools.cached_property
+    def cache_path(self) -> str:
+        """仓库的缓存目录，首次读写缓存时才计算，不使用缓存的分析器不会执行 git 命令确定仓库标识
+
+        Returns:
+            缓存目录路径
+        """
+        # 使用仓库标识的哈希作为缓存目录名，同一仓库每次克隆到不同的临时目录时也能命中缓存
+        repo_hash = hashlib.md5(self._repo_identity().encode()).hexdigest()
+        return os.path.join(self.CACHE_DIR, repo_hash)
+
+    def get_commit_history(
+        self, max_count: int = 100, branch: str = "main", include_stats: bool = True
+    ) -> List[Dict[str, Any]]:
         """获取提交历史
 
         Args:
             max_count: 最大提交数量
             branch: 分支名称
+            include_stats: 是否统计每个提交的文件变更，不需要 stats 时关闭可省去 git 计算差异的开销
 
         Returns:
             提交历史列表
@@ -43,30 +112,42 @@ class GitHistoryAnalyzer:
 
         try:
             log_and_notify(f"获取分支 {branch} 的提交历史，最大数量: {max_count}", "info")
-            commits = list(self.repo.iter_commits(branch, max_count=max_count))
-
-            history = []
-            for commit in commits:
-                history.append(
-                    {
-                        "hash": commit.hexsha,
-                        "short_hash": commit.hexsha[:7],
-                        "author": f"{commit.author.name} <{commit.author.email}>",
-                        "date": datetime.fromtimestamp(commit.committed_date).isoformat(),
-                        "message": commit.message.strip(),
-                        "stats": {
-                            "files": len(commit.stats.files),
-                            "insertions": commit.stats.total["insertions"],
-                            "deletions": commit.stats.total["deletions"],
-                        },
-                    }
-                )
-
-            return history
+            self._deepen_history(branch, max_count)
+            return self._cached(
+                "get_commit_history",
+                (max_count, branch, include_stats),
+                lambda: list(self.iter_commit_history(max_count=max_count, branch=branch, include_stats=include_stats)),
+            )
         except Exception as e:
             log_and_notify(f"获取提交历史失败: {str(e)}", "error")
             return []
 
+    def iter_commit_history(
+        self, max_count: int = 100, branch: str = "main", include_stats: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """逐个生成提交历史
+
+        边读取 git log 的输出边解析，调用方提前停止迭代时剩余的提交不会被读取和解析。
+
+        Args:
+            max_count: 最大提交数量
+            branch: 分支名称
+            include_stats: 是否统计每个提交的文件变更
+
+        Yields:
+            提交信息，与 get_commit_history 列表中的元素相同
+
+        Raises:
+            GitCommandError: git log 执行失败（如分支不存在）
+        """
+        if self.repo is None:
+            log_and_notify("仓库未初始化，无法获取提交历史", "error")
+            return
+
+        for commit in self._iter_log(branch, max_count, include_stats=include_stats):
+            commit.pop("file_changes", None)
+            yield commit
+
     def get_commit_details(self, commit_hash: str) -> Optional[Dict[str, Any]]:
         """获取提交详情
 
@@ -81,40 +162,34 @@ class GitHistoryAnalyzer:
             return None
 
         try:
-            commit = self.repo.commit(commit_hash)
             log_and_notify(f"获取提交详情: {commit_hash[:7]}", "info")
-
-            # 获取文件变更
-            file_changes = []
-            for file_path, stats in commit.stats.files.items():
-                file_changes.append(
-                    {
-                        "path": file_path,
-                        "insertions": stats["insertions"],
-                        "deletions": stats["deletions"],
-                        "changes": stats["lines"],
-                    }
-                )
-
-            return {
-                "hash": commit.hexsha,
-                "short_hash": commit.hexsha[:7],
-                "author": f"{commit.author.name} <{commit.author.email}>",
-                "date": datetime.fromtimestamp(commit.committed_date).isoformat(),
-                "message": commit.message.strip(),
-                "stats": {
-                    "files": len(commit.stats.files),
-                    "insertions": commit.stats.total["insertions"],
-                    "deletions": commit.stats.total["deletions"],
-                },
-                "file_changes": file_changes,
-            }
+            return self._cached(
+                "get_commit_details", (commit_hash,), lambda: next(self._iter_log(commit_hash, 1), None)
+            )
         except Exception as e:
             log_and_notify(f"获取提交详情失败: {str(e)}", "error")
             return None
 
+    def get_many_commit_details(self, commit_hashes: List[str], max_workers: int = 8) -> List[Optional[Dict[str, Any]]]:
+        """并行获取多个提交的详情
+
+        每个提交的详情由独立的 git 子进程计算，等待子进程时会释放 GIL，因此使用线程池并行执行。
+
+        Args:
+            commit_hashes: 提交哈希列表
+            max_workers: 最大线程数
+
+        Returns:
+            与 commit_hashes 顺序一致的提交详情列表，不存在的提交对应 None
+        """
+        if len(commit_hashes) < 2:
+            return [self.get_commit_details(commit_hash) for commit_hash in commit_hashes]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(commit_hashes))) as executor:
+            return list(executor.map(self.get_commit_details, commit_hashes))
+
     def get_file_history(self, file_path: str, max_count: int = 50) -> List[Dict[str, Any]]:
-        """获取文件的提交历史
+        """获取文件的提交历史，文件被重命名过时包含重命名之前的提交
 
         Args:
             file_path: 文件路径
@@ -130,25 +205,118 @@ class GitHistoryAnalyzer:
         try:
             log_and_notify(f"获取文件历史: {file_path}，最大数量: {max_count}", "info")
 
-            # 获取文件的提交历史
-            commits = list(self.repo.iter_commits(paths=file_path, max_count=max_count))
+            # 获取文件的提交历史，不需要变更统计。涉及该文件的提交可能分布在任意深度，浅克隆时加深有限的历史
+            self._deepen_history()
+            # --follow 只能跟踪单个文件的重命名，路径为目录时按普通路径过滤
+            working_tree_dir = self.repo.working_tree_dir
+            follow = working_tree_dir is not None and os.path.isfile(os.path.join(working_tree_dir, file_path))
+            return self._cached(
+                "get_file_history",
+                (file_path, max_count, follow),
+                lambda: list(self._iter_log("HEAD", max_count, path=file_path, include_stats=False, follow=follow)),
+            )
+        except Exception as e:
+            log_and_notify(f"获取文件历史失败: {str(e)}", "error")
+            return []
+
+    def _iter_log(
+        self,
+        rev: str,
+        max_count: int,
+        path: Optional[str] = None,
+        include_stats: bool = True,
+        follow: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """通过一次 git log 调用逐个生成多个提交的信息和变更统计
+
+        GitPython 逐个提交读取作者等属性、访问 commit.stats 时还会为每个提交单独执行一次 git diff，
+        这里改为一个 git log 子进程输出全部字段和 --numstat 统计，并按行流式读取解析，
+        不会把全部输出读入内存。统计与 commit.stats 一致：不检测重命名，合并提交与第一个父提交比较，
+        根提交与空树比较。
+
+        Args:
+            rev: 起始版本（分支名、提交哈希等）
+            max_count: 最大提交数量
+            path: 只包含修改了该路径的提交，为 None 时不限制
+            include_stats: 是否统计文件变更
+            follow: 是否跟踪 path 所指文件的重命名
 
-            history = []
-            for commit in commits:
-                history.append(
+        Yields:
+            提交信息，include_stats 为 True 时包含 stats 和 file_changes
+
+        Raises:
+            GitCommandError: git log 执行失败（如版本不存在）
+        """
+        assert self.repo is not None, "Repo has not been initialized!"
+        args = [f"--max-count={max_count}", f"--pretty=format:{_LOG_FORMAT}"]
+        if include_stats:
+            args.extend(["--numstat", "--no-renames", "--diff-merges=first-parent"])
+        if follow and path:
+            args.append("--follow")
+        args.extend([rev, "--"])
+        if path:
+            args.append(path)
+
+        # 每个提交记录都从新的一行开始，读到下一个记录分隔符时解析上一个记录
+        process = self.repo.git.log(*args, as_process=True)
+        record_lines: List[str] = []
+        for raw_line in process.stdout:
+            line = safe_decode(raw_line)
+            if line.startswith(_LOG_RECORD_SEP) and record_lines:
+                yield self._parse_log_record("".join(record_lines), include_stats)
+                record_lines = []
+            record_lines.append(line)
+        if record_lines:
+            yield self._parse_log_record("".join(record_lines), include_stats)
+
+        # 输出读取完毕后检查退出状态，失败时抛出 GitCommandError
+        process.wait()
+
+    @staticmethod
+    def _parse_log_record(record: str, include_stats: bool) -> Dict[str, Any]:
+        """解析单个提交的 git log 输出记录
+
+        Args:
+            record: 以记录分隔符开头的提交记录
+            include_stats: 记录中是否包含 --numstat 统计
+
+        Returns:
+            提交信息
+        """
+        hexsha, name, email, committed_date, message, numstat = record[1:].split(_LOG_FIELD_SEP, 5)
+        commit: Dict[str, Any] = {
+            "hash": hexsha,
+            "short_hash": hexsha[:7],
+            "author": f"{name} <{email}>",
+            "date": datetime.fromtimestamp(int(committed_date)).isoformat(),
+            "message": message.strip(),
+        }
+
+        if include_stats:
+            # 统计行格式为 "增加行数\t删除行数\t路径"，二进制文件的行数为 "-"
+            file_changes = []
+            for line in numstat.splitlines():
+                if not line:
+                    continue
+                raw_insertions, raw_deletions, file_path = line.split("\t", 2)
+                insertions = int(raw_insertions) if raw_insertions != "-" else 0
+                deletions = int(raw_deletions) if raw_deletions != "-" else 0
+                file_changes.append(
                     {
-                        "hash": commit.hexsha,
-                        "short_hash": commit.hexsha[:7],
-                        "author": f"{commit.author.name} <{commit.author.email}>",
-                        "date": datetime.fromtimestamp(commit.committed_date).isoformat(),
-                        "message": commit.message.strip(),
+                        "path": _unquote_path(file_path.strip()),
+                        "insertions": insertions,
+                        "deletions": deletions,
+                        "changes": insertions + deletions,
                     }
                 )
+            commit["stats"] = {
+                "files": len(file_changes),
+                "insertions": sum(change["insertions"] for change in file_changes),
+                "deletions": sum(change["deletions"] for change in file_changes),
+            }
+            commit["file_changes"] = file_changes
 
-            return history
-        except Exception as e:
-            log_and_notify(f"获取文件历史失败: {str(e)}", "error")
-            return []
+        return commit
 
     def analyze_contributors(self) -> List[Dict[str, Any]]:
         """分析贡献者信息
@@ -162,33 +330,190 @@ class GitHistoryAnalyzer:
 
         try:
             log_and_notify("分析仓库贡献者", "info")
-
-            # 使用 Git 命令获取贡献者信息
-            shortlog = self.repo.git.shortlog("-sne", "--all")
-
-            contributors = []
-            for line in shortlog.splitlines():
-                parts = line.strip().split("\t")
-                if len(parts) == 2:
-                    commits = int(parts[0].strip())
-                    author_info = parts[1].strip()
-
-                    # 解析作者信息
-                    name = author_info
-                    email = ""
-                    if "<" in author_info and ">" in author_info:
-                        name = author_info.split("<")[0].strip()
-                        email = author_info.split("<")[1].split(">")[0].strip()
-
-                    contributors.append(
-                        {
-                            "name": name,
-                            "email": email,
-                            "commits": commits,
-                        }
-                    )
-
-            return contributors
+            self._deepen_history()
+            return self._cached("analyze_contributors", (), self._collect_contributors)
         except Exception as e:
             log_and_notify(f"分析贡献者失败: {str(e)}", "error")
             return []
+
+    def _collect_contributors(self) -> List[Dict[str, Any]]:
+        """通过 git log 统计所有分支的贡献者
+
+        与 git shortlog -sne --all 的结果一致：按 .mailmap 映射作者，按提交数降序、作者升序排列。
+
+        Returns:
+            贡献者信息列表
+        """
+        assert self.repo is not None, "Repo has not been initialized!"
+
+        # 每个提交输出一条以 NUL 结尾的 "作者\t邮箱" 记录，直接按记录计数，无需解析 "作者 <邮箱>"
+        output = self.repo.git.log("--all", "-z", "--format=%aN\t%aE")
+        author_counts = Counter(record for record in output.split("\0") if record)
+
+        contributors = []
+        for author, commits in sorted(author_counts.items(), key=lambda item: (-item[1], item[0].replace("\t", " <"))):
+            name, email = author.split("\t", 1)
+            contributors.append(
+                {
+                    "name": name.strip(),
+                    "email": email.strip(),
+                    "commits": commits,
+                }
+            )
+
+        return contributors
+
+    def _shallow_commits(self) -> str:
+        """读取浅克隆仓库的历史边界提交
+
+        Returns:
+            .git/shallow 文件内容，完整克隆的仓库返回空字符串
+        """
+        assert self.repo is not None, "Repo has not been initialized!"
+        try:
+            with open(os.path.join(self.repo.git_dir, "shallow"), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
+
+    def _repo_identity(self) -> str:
+        """获取不随本地路径变化的仓库标识
+
+        优先使用 origin 远程地址，没有远程时使用根提交，空仓库等无法确定时使用仓库的绝对路径。
+        缓存键本身包含全部引用的状态，共享根提交的不同仓库使用同一个缓存目录也不会读到错误的结果。
+
+        Returns:
+            仓库标识
+        """
+        if self.repo is not None:
+            try:
+                return self.repo.git.config("--get", "remote.origin.url")
+            except GitCommandError:
+                pass
+            try:
+                return self.repo.git.rev_list("--max-parents=0", "HEAD", "--")
+            except GitCommandError:
+                pass
+        return os.path.abspath(self.repo_path)
+
+    def _deepen_history(self, rev: Optional[str] = None, max_count: int = 0) -> None:
+        """浅克隆的仓库历史不足时从远程拉取更多提交
+
+        Args:
+            rev: 需要历史的起始版本，为 None 时加深 SHALLOW_DEEPEN_COMMITS 个提交，每个实例只加深一次
+            max_count: 从 rev 开始需要的提交数量
+        """
+        assert self.repo is not None, "Repo has not been initialized!"
+        shallow_commits = self._shallow_commits()
+        if not shallow_commits:
+            return
+
+        try:
+            if rev is None:
+                if self._deepened:
+                    return
+                self._deepened = True
+                log_and_notify(f"仓库为浅克隆，历史加深 {self.SHALLOW_DEEPEN_COMMITS} 个提交", "info")
+                self.repo.git.fetch(f"--deepen={self.SHALLOW_DEEPEN_COMMITS}")
+                return
+
+            # 前 max_count 个提交中出现历史边界时，说明更早的提交和边界提交的父提交都还没有拉取
+            boundaries = set(shallow_commits.split())
+            if boundaries.isdisjoint(self.repo.git.rev_list(f"--max-count={max_count}", rev, "--").split()):
+                return
+            log_and_notify(f"仓库为浅克隆，历史加深 {max_count} 个提交", "info")
+            self.repo.git.fetch(f"--deepen={max_count}")
+        except GitCommandError as e:
+            log_and_notify(f"拉取更多历史失败，使用已有的历史: {str(e)}", "warning")
+
+    def _cached(self, method: str, args: Tuple[Any, ...], compute: Callable[[], _T]) -> _T:
+        """从磁盘缓存读取查询结果，未命中时计算并写入缓存
+
+        提交一旦创建就不会改变，查询结果只取决于各引用指向的提交和浅克隆的历史边界，因此缓存键由全部引用（含 HEAD）
+        的当前状态、历史边界、方法名和参数组成，任何引用变化或历史加深都会自然地使旧结果失效。
+        计算失败时异常直接抛出，不写入缓存。
+
+        Args:
+            method: 方法名
+            args: 方法参数，必须可以序列化为 JSON
+            compute: 未命中缓存时计算结果的函数，结果必须可以序列化为 JSON
+
+        Returns:
+            查询结果
+        """
+        if not self.use_cache or self.repo is None:
+            return compute()
+
+        try:
+            refs = self.repo.git.show_ref("--head")
+        except GitCommandError:
+            # 空仓库等没有任何引用时不使用缓存
+            return compute()
+
+        cache_key = hashlib.md5(json.dumps([refs, self._shallow_commits(), method, args]).encode()).hexdigest()
+        cache_file = os.path.join(self.cache_path, f"{cache_key}.json")
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                result: _T = json.load(f)
+            # 更新修改时间，作为淘汰缓存结果和仓库缓存目录时的最近使用时间
+            os.utime(cache_file)
+            os.utime(self.cache_path)
+            return result
+        except (OSError, ValueError):
+            pass
+
+        result = compute()
+        self._write_cache(cache_file, result)
+        return result
+
+    def _write_cache(self, cache_file: str, result: Any) -> None:
+        """写入缓存文件，并在超出数量上限时删除最久未使用的缓存
+
+        Args:
+            cache_file: 缓存文件路径
+            result: 查询结果
+        """
+        try:
+            if not os.path.isdir(self.cache_path):
+                os.makedirs(self.cache_path, exist_ok=True)
+                self._prune_repo_caches()
+
+            # 先写入临时文件再替换，并发查询时其他线程不会读到不完整的缓存。
+            # 非 UTF-8 的文件名解码后包含代理字符，使用默认的 ASCII 转义才能写入并原样读回
+            temp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    json.dump(result, f)
+                os.replace(temp_file, cache_file)
+            except (OSError, ValueError):
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+                raise
+
+            with os.scandir(self.cache_path) as entries:
+                cache_entries = [
+                    (entry.stat().st_mtime, entry.path) for entry in entries if entry.name.endswith(".json")
+                ]
+            if len(cache_entries) > self.CACHE_MAX_ENTRIES:
+                cache_entries.sort()
+                for _, stale_path in cache_entries[: len(cache_entries) - self.CACHE_MAX_ENTRIES]:
+                    try:
+                        os.remove(stale_path)
+                    except FileNotFoundError:
+                        pass
+        except (OSError, ValueError) as e:
+            log_and_notify(f"写入 Git 历史缓存失败: {str(e)}", "warning")
+
+    def _prune_repo_caches(self) -> None:
+        """缓存的仓库数量超出上限时，删除最久未使用的仓库的缓存目录"""
+        with os.scandir(self.CACHE_DIR) as entries:
+            repo_dirs = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in entries
+                if entry.is_dir() and entry.path != self.cache_path
+            ]
+        # 为当前仓库的缓存目录保留一个位置
+        if len(repo_dirs) >= self.CACHE_MAX_REPOS:
+            repo_dirs.sort()
+            for _, stale_dir in repo_dirs[: len(repo_dirs) - self.CACHE_MAX_REPOS + 1]:
+                shutil.rmtree(stale_dir, ignore_errors=True)
@@ -1,12 +1,14 @@
 """Git 仓库管理器，提供 Git 仓库的基本操作。"""
 
+import functools
 import hashlib
 import json
 import os
 import shutil
 import tempfile
+import threading
 import time
-from typing import List, Optional, cast
+from typing import Any, Dict, List, Optional, cast
 
 from git import GitCommandError, Repo
 
@@ -14,6 +16,16 @@ from ..config_loader import ConfigLoader
 from ..logger import log_and_notify
 
 
+@functools.lru_cache(maxsize=None)
+def _get_config_loader() -> ConfigLoader:
+    """获取配置加载器，配置文件只在首次创建仓库管理器时解析一次
+
+    Returns:
+        配置加载器
+    """
+    return ConfigLoader()
+
+
 class GitRepoManager:
     """Git 仓库管理器，提供 Git 仓库的基本操作"""
 
@@ -43,16 +55,19 @@ class GitRepoManager:
             self.local_path = local_path
 
         # 获取缓存配置
-        config_loader = ConfigLoader()
+        config_loader = _get_config_loader()
         self.cache_ttl = config_loader.get("git.cache_ttl", 86400)  # 默认24小时
+        # 浅克隆深度，0 表示克隆完整历史；历史分析需要更多提交时会按需加深
+        self.clone_depth = config_loader.get("git.clone_depth", 0)
 
         self.repo = None
         log_and_notify(
             f"初始化 Git 仓库管理器: {repo_url} -> {self.local_path}, 缓存: {'启用' if use_cache else '禁用'}", "info"
         )
 
-    def _get_repo_hash(self) -> str:
-        """获取仓库的唯一哈希值，用于缓存标识
+    @functools.cached_property
+    def _repo_hash(self) -> str:
+        """仓库的唯一哈希值，用于缓存标识，每个分支只计算一次
 
         Returns:
             仓库哈希值
@@ -61,8 +76,9 @@ class GitRepoManager:
         repo_id = f"{self.repo_url}#{self.branch}"
         return hashlib.md5(repo_id.encode()).hexdigest()
 
-    def _get_cache_path(self) -> str:
-        """获取缓存路径
+    @functools.cached_property
+    def _cache_path(self) -> str:
+        """缓存路径，首次访问时确保缓存根目录存在
 
         Returns:
             缓存路径
@@ -71,16 +87,40 @@ class GitRepoManager:
         os.makedirs(self.CACHE_DIR, exist_ok=True)
 
         # 使用仓库哈希作为缓存目录名
-        repo_hash = self._get_repo_hash()
-        return os.path.join(self.CACHE_DIR, repo_hash)
+        return os.path.join(self.CACHE_DIR, self._repo_hash)
 
-    def _get_cache_meta_path(self) -> str:
-        """获取缓存元数据路径
+    @functools.cached_property
+    def _cache_meta_path(self) -> str:
+        """缓存元数据路径
 
         Returns:
             缓存元数据路径
         """
-        return os.path.join(self._get_cache_path(), "meta.json")
+        return os.path.join(self._cache_path, "meta.json")
+
+    @functools.cached_property
+    def _cache_meta(self) -> Optional[Dict[str, Any]]:
+        """缓存元数据，首次访问时从文件读取，之后由 _update_cache 直接更新，重复检查缓存时无需再次读取文件
+
+        Returns:
+            缓存元数据，元数据文件不存在或读取失败时返回 None
+        """
+        # 检查元数据文件是否存在
+        if not os.path.exists(self._cache_meta_path):
+            return None
+
+        try:
+            # 读取元数据
+            with open(self._cache_meta_path, "r") as f:
+                return cast(Dict[str, Any], json.load(f))
+        except Exception as e:
+            log_and_notify(f"读取缓存元数据失败: {str(e)}", "error")
+            return None
+
+    def _reset_cache_paths(self) -> None:
+        """分支变化后清除已缓存的仓库哈希、缓存路径和元数据，下次访问时重新计算"""
+        for attr in ("_repo_hash", "_cache_path", "_cache_meta_path", "_cache_meta"):
+            self.__dict__.pop(attr, None)
 
     def _is_cache_valid(self) -> bool:
         """检查缓存是否有效
@@ -91,18 +131,11 @@ class GitRepoManager:
         if not self.use_cache:
             return False
 
-        cache_path = self._get_cache_path()
-        meta_path = self._get_cache_meta_path()
-
-        # 检查缓存目录和元数据文件是否存在
-        if not os.path.exists(cache_path) or not os.path.exists(meta_path):
+        meta = self._cache_meta
+        if meta is None:
             return False
 
         try:
-            # 读取元数据
-            with open(meta_path, "r") as f:
-                meta = json.load(f)
-
             # 检查缓存时间是否过期
             cache_time = meta.get("time", 0)
             current_time = time.time()
@@ -124,34 +157,40 @@ class GitRepoManager:
         if not self.use_cache or not self.repo:
             return False
 
+        cache_path = self._cache_path
+        # 新缓存先写入同级临时目录，完成后通过重命名替换旧缓存，读取方不会看到删除或写入到一半的缓存。
+        # git 命令在仓库目录下执行，因此使用绝对路径
+        temp_path = os.path.abspath(f"{cache_path}.tmp.{os.getpid()}.{threading.get_ident()}")
         try:
-            cache_path = self._get_cache_path()
-            meta_path = self._get_cache_meta_path()
-
-            # 如果缓存目录已存在，先删除
-            if os.path.exists(cache_path):
-                shutil.rmtree(cache_path)
-
-            # 创建缓存目录
-            os.makedirs(cache_path, exist_ok=True)
+            os.makedirs(temp_path)
 
             # 复制仓库到缓存目录
             if self.local_path != cache_path:
                 # 使用git clone --mirror命令创建裸仓库缓存
-                mirror_path = os.path.join(cache_path, "mirror")
-                os.makedirs(mirror_path, exist_ok=True)
-                self.repo.git.clone("--mirror", self.local_path, mirror_path)
+                self.repo.git.clone("--mirror", self.local_path, os.path.join(temp_path, "mirror"))
 
             # 创建元数据
             meta = {"repo_url": self.repo_url, "branch": self.branch, "time": time.time()}
 
             # 保存元数据
-            with open(meta_path, "w") as f:
+            with open(os.path.join(temp_path, os.path.basename(self._cache_meta_path)), "w") as f:
                 json.dump(meta, f)
 
+            # 旧缓存先移到一边再换入新缓存，旧缓存在后台线程中删除，不阻塞当前流程
+            stale_path = None
+            if os.path.exists(cache_path):
+                stale_path = f"{temp_path}.old"
+                os.replace(cache_path, stale_path)
+            os.replace(temp_path, cache_path)
+            self.__dict__["_cache_meta"] = meta
+            if stale_path:
+                threading.Thread(target=shutil.rmtree, args=(stale_path, True), daemon=True).start()
+
             log_and_notify(f"更新仓库缓存: {self.repo_url} -> {cache_path}", "info")
             return True
         except Exception as e:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            self.__dict__.pop("_cache_meta", None)
             log_and_notify(f"更新缓存失败: {str(e)}", "error")
             return False
 
@@ -165,12 +204,29 @@ class GitRepoManager:
             return False
 
         try:
-            cache_path = self._get_cache_path()
-            mirror_path = os.path.join(cache_path, "mirror")
+            cache_path = self._cache_path
+            mirror_path = os.path.abspath(os.path.join(cache_path, "mirror"))
 
             # 确保目标目录存在
             os.makedirs(self.local_path, exist_ok=True)
 
+            # 浅克隆得到的缓存不能作为 --reference，只能直接从缓存克隆
+            if not os.path.exists(os.path.join(mirror_path, "shallow")):
+                try:
+                    # 以缓存作为对象来源从远程克隆：已缓存的对象不再经网络传输，只拉取缓存之后的新提交。
+                    # --dissociate 会在克隆完成后复制借用的对象，之后重建或清理缓存不会影响工作仓库
+                    log_and_notify(f"参考缓存克隆仓库: {self.repo_url} -> {self.local_path}", "info")
+                    self.repo = Repo.clone_from(
+                        self.repo_url,
+                        self.local_path,
+                        branch=self.branch,
+                        multi_options=["--reference", mirror_path, "--dissociate"],
+                    )
+                    return True
+                except GitCommandError as e:
+                    # 远程不可用（例如离线）时退回到直接从缓存克隆
+                    log_and_notify(f"参考缓存克隆失败，直接从缓存克隆: {str(e)}", "warning")
+
             # 从缓存克隆到目标目录
             log_and_notify(f"从缓存克隆仓库: {mirror_path} -> {self.local_path}", "info")
             self.repo = Repo.clone_from(mirror_path, self.local_path, branch=self.branch)
@@ -203,7 +259,9 @@ class GitRepoManager:
 
             # 如果缓存无效或使用缓存失败，直接克隆
             log_and_notify(f"克隆仓库 {self.repo_url} 到 {self.local_path}", "info")
-            self.repo = Repo.clone_from(self.repo_url, self.local_path, branch=self.branch)
+            # 浅克隆只拉取最近的提交；--depth 默认隐含 --single-branch，这里保留其他分支以便之后检出
+            clone_options = {"depth": self.clone_depth, "no_single_branch": True} if self.clone_depth > 0 else {}
+            self.repo = Repo.clone_from(self.repo_url, self.local_path, branch=self.branch, **clone_options)
 
             # 更新缓存
             if self.use_cache:
@@ -231,6 +289,7 @@ class GitRepoManager:
             log_and_notify(f"检出分支: {branch}", "info")
             self.repo.git.checkout(branch)
             self.branch = branch
+            self._reset_cache_paths()
             return True
         except GitCommandError as e:
             log_and_notify(f"检出分支失败: {str(e)}", "error")
@@ -273,8 +332,9 @@ class GitRepoManager:
             # 获取指定引用的文件列表
             if path == "":
                 path = "."
-            files = self.repo.git.ls_tree("-r", "--name-only", ref, path).splitlines()
-            return [f for f in files if path == "." or f.startswith(path)]
+            # 路径过滤交给 git 的 pathspec 完成；-z 以 NUL 分隔输出，非 ASCII 文件名不会被转义
+            output = self.repo.git.ls_tree("-r", "-z", "--name-only", "--full-tree", ref, "--", path)
+            return output.split("\0")[:-1]
         except GitCommandError as e:
             log_and_notify(f"获取文件列表失败: {str(e)}", "error")
             return []
@@ -1,89 +1,25 @@
 """语言工具，用于检测语言和提取技术术语。"""
 
+import functools
 import re
-from typing import List, Optional, Set, Tuple
+from typing import FrozenSet, List, Optional, Set, Tuple
 
+# U+4E00-U+9FFF 的中文字符在 UTF-8 中编码为三个字节：U+5000-U+9FFF 的首字节为 E5-E9，
+# U+4E00-U+4FFF 为 E4 后接 B8-BF。首字节只会出现在字符开头，因此按字节计数即可得到字符数
+_CJK_LEAD_TABLE = bytes(1 if 0xE5 <= byte <= 0xE9 else 0 for byte in range(256))
+_CJK_E4_PREFIXES = tuple(bytes((0xE4, second)) for second in range(0xB8, 0xC0))
 
-def detect_natural_language(text: str) -> Tuple[str, float]:
-    """检测文本的自然语言
-
-    Args:
-        text: 文本
-
-    Returns:
-        检测到的语言和置信度
-    """
-    # 简单实现：根据中文字符比例判断
-    chinese_chars = len(re.findall(r"[\u4e00-\u9fff]", text))
-    total_chars = len(text)
-
-    if total_chars == 0:
-        return "en", 0.0
-
-    chinese_ratio = chinese_chars / total_chars
-
-    if chinese_ratio > 0.1:
-        return "zh", chinese_ratio
-    else:
-        return "en", 1.0 - chinese_ratio
-
-
-def extract_technical_terms(text: str, domain: Optional[str] = None, language: Optional[str] = None) -> List[str]:
-    """提取技术术语
-
-    Args:
-        text: 文本
-        domain: 领域
-        language: 语言
-
-    Returns:
-        技术术语列表
-    """
-    # 如果未指定语言，检测语言
-    if language is None:
-        language, _ = detect_natural_language(text)
-
-    # 提取技术术语
-    terms = set()
-
-    # 提取代码块中的术语
-    code_blocks = re.findall(r"```.*?\n(.*?)```", text, re.DOTALL)
-    for block in code_blocks:
-        # 提取变量名、函数名、类名等
-        identifiers = re.findall(r"\b[a-zA-Z_][a-zA-Z0-9_]*\b", block)
-        terms.update(identifiers)
-
-    # 提取行内代码中的术语
-    inline_codes = re.findall(r"`([^`]+)`", text)
-    for code in inline_codes:
-        # 提取变量名、函数名、类名等
-        identifiers = re.findall(r"\b[a-zA-Z_][a-zA-Z0-9_]*\b", code)
-        terms.update(identifiers)
-
-    # 提取常见技术术语
-    common_terms = _get_common_technical_terms(domain, language)
-    for term in common_terms:
-        if term.lower() in text.lower():
-            terms.add(term)
-
-    # 过滤掉常见的非技术词
-    filtered_terms = _filter_common_words(terms)
-
-    return list(filtered_terms)
-
-
-def _get_common_technical_terms(domain: Optional[str] = None, language: Optional[str] = None) -> Set[str]:
-    """获取常见技术术语
-
-    Args:
-        domain: 领域
-        language: 语言
+# 术语提取使用的预编译正则：代码块内容、行内代码和标识符
+_CODE_BLOCK_RE = re.compile(r"```.*?\n(.*?)```", re.DOTALL)
+_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+_IDENTIFIER_RE = re.compile(r"\b[a-zA-Z_][a-zA-Z0-9_]*\b")
+# 纯 ASCII 文本的标识符分词表：标识符字符保持不变，其余字节映射为空格
+_IDENTIFIER_BYTES = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_")
+_IDENTIFIER_TABLE = bytes(byte if byte in _IDENTIFIER_BYTES else 0x20 for byte in range(256))
 
-    Returns:
-        常见技术术语集合
-    """
-    # 通用技术术语
-    common_terms = {
+# 通用技术术语
+_COMMON_TERMS_BASE = frozenset(
+    {
         "API",
         "REST",
         "HTTP",
@@ -206,148 +142,135 @@ def _get_common_technical_terms(domain: Optional[str] = None, language: Optional
         "Agent",
         "Agentic",
     }
+)
 
-    # 根据领域添加特定术语
-    if domain == "web":
-        common_terms.update(
-            {
-                "React",
-                "Angular",
-                "Vue",
-                "Svelte",
-                "Next.js",
-                "Nuxt.js",
-                "Gatsby",
-                "Webpack",
-                "Babel",
-                "ESLint",
-                "Prettier",
-                "Jest",
-                "Mocha",
-                "Chai",
-                "Cypress",
-                "Selenium",
-                "Puppeteer",
-                "Playwright",
-                "SPA",
-                "PWA",
-                "SSR",
-                "SSG",
-                "CSR",
-                "SEO",
-                "Accessibility",
-                "a11y",
-                "i18n",
-                "l10n",
-                "WCAG",
-                "ARIA",
-                "DOM",
-                "BOM",
-                "AJAX",
-                "Fetch",
-                "Axios",
-                "GraphQL",
-                "Redux",
-                "Vuex",
-                "MobX",
-                "Pinia",
-                "Tailwind",
-                "Bootstrap",
-                "Material UI",
-                "Chakra UI",
-            }
-        )
-    elif domain == "data":
-        common_terms.update(
-            {
-                "ETL",
-                "ELT",
-                "Data Warehouse",
-                "Data Lake",
-                "Data Mesh",
-                "Data Fabric",
-                "Hadoop",
-                "Spark",
-                "Flink",
-                "Kafka",
-                "Airflow",
-                "Dagster",
-                "dbt",
-                "Looker",
-                "Tableau",
-                "Power BI",
-                "Superset",
-                "Metabase",
-                "Redshift",
-                "Snowflake",
-                "BigQuery",
-                "Databricks",
-                "Delta Lake",
-                "Iceberg",
-                "Hudi",
-                "Parquet",
-                "Avro",
-                "ORC",
-                "Arrow",
-                "Dask",
-                "Ray",
-                "Polars",
-                "DuckDB",
-                "ClickHouse",
-            }
-        )
-
-    # 根据语言添加特定术语
-    if language == "zh":
-        common_terms.update(
-            {
-                "人工智能",
-                "机器学习",
-                "深度学习",
-                "自然语言处理",
-                "计算机视觉",
-                "强化学习",
-                "神经网络",
-                "卷积神经网络",
-                "循环神经网络",
-                "长短期记忆网络",
-                "门控循环单元",
-                "变换器",
-                "注意力机制",
-                "自注意力",
-                "多头注意力",
-                "编码器",
-                "解码器",
-                "嵌入",
-                "向量",
-                "检索增强生成",
-                "提示",
-                "补全",
-                "微调",
-                "迁移学习",
-                "大语言模型",
-                "生成式人工智能",
-                "代码库",
-                "知识库",
-                "文档生成",
-                "教程生成",
-            }
-        )
-
-    return common_terms
-
-
-def _filter_common_words(terms: Set[str]) -> Set[str]:
-    """过滤常见的非技术词
+# 各领域的特定术语
+_COMMON_TERMS_WEB = frozenset(
+    {
+        "React",
+        "Angular",
+        "Vue",
+        "Svelte",
+        "Next.js",
+        "Nuxt.js",
+        "Gatsby",
+        "Webpack",
+        "Babel",
+        "ESLint",
+        "Prettier",
+        "Jest",
+        "Mocha",
+        "Chai",
+        "Cypress",
+        "Selenium",
+        "Puppeteer",
+        "Playwright",
+        "SPA",
+        "PWA",
+        "SSR",
+        "SSG",
+        "CSR",
+        "SEO",
+        "Accessibility",
+        "a11y",
+        "i18n",
+        "l10n",
+        "WCAG",
+        "ARIA",
+        "DOM",
+        "BOM",
+        "AJAX",
+        "Fetch",
+        "Axios",
+        "GraphQL",
+        "Redux",
+        "Vuex",
+        "MobX",
+        "Pinia",
+        "Tailwind",
+        "Bootstrap",
+        "Material UI",
+        "Chakra UI",
+    }
+)
+_COMMON_TERMS_DATA = frozenset(
+    {
+        "ETL",
+        "ELT",
+        "Data Warehouse",
+        "Data Lake",
+        "Data Mesh",
+        "Data Fabric",
+        "Hadoop",
+        "Spark",
+        "Flink",
+        "Kafka",
+        "Airflow",
+        "Dagster",
+        "dbt",
+        "Looker",
+        "Tableau",
+        "Power BI",
+        "Superset",
+        "Metabase",
+        "Redshift",
+        "Snowflake",
+        "BigQuery",
+        "Databricks",
+        "Delta Lake",
+        "Iceberg",
+        "Hudi",
+        "Parquet",
+        "Avro",
+        "ORC",
+        "Arrow",
+        "Dask",
+        "Ray",
+        "Polars",
+        "DuckDB",
+        "ClickHouse",
+    }
+)
 
-    Args:
-        terms: 术语集合
+# 中文特定术语
+_COMMON_TERMS_ZH = frozenset(
+    {
+        "人工智能",
+        "机器学习",
+        "深度学习",
+        "自然语言处理",
+        "计算机视觉",
+        "强化学习",
+        "神经网络",
+        "卷积神经网络",
+        "循环神经网络",
+        "长短期记忆网络",
+        "门控循环单元",
+        "变换器",
+        "注意力机制",
+        "自注意力",
+        "多头注意力",
+        "编码器",
+        "解码器",
+        "嵌入",
+        "向量",
+        "检索增强生成",
+        "提示",
+        "补全",
+        "微调",
+        "迁移学习",
+        "大语言模型",
+        "生成式人工智能",
+        "代码库",
+        "知识库",
+        "文档生成",
+        "教程生成",
+    }
+)
 
-    Returns:
-        过滤后的术语集合
-    """
-    # 常见的非技术词
-    common_words = {
+# 常见的非技术词
+_COMMON_WORDS = frozenset(
+    {
         "a",
         "an",
         "the",
@@ -593,6 +516,153 @@ def _filter_common_words(terms: Set[str]) -> Set[str]:
         "written",
         "writing",
     }
+)
+
+
+def detect_natural_language(text: str) -> Tuple[str, float]:
+    """检测文本的自然语言
+
+    Args:
+        text: 文本
+
+    Returns:
+        检测到的语言和置信度
+    """
+    # 简单实现：根据中文字符比例判断。按 UTF-8 字节查表计数，无需逐字符运行正则并构造匹配列表
+    encoded = text.encode("utf-8", "surrogatepass")
+    chinese_chars = encoded.translate(_CJK_LEAD_TABLE).count(1) + sum(
+        encoded.count(prefix) for prefix in _CJK_E4_PREFIXES
+    )
+    total_chars = len(text)
+
+    if total_chars == 0:
+        return "en", 0.0
+
+    chinese_ratio = chinese_chars / total_chars
+
+    if chinese_ratio > 0.1:
+        return "zh", chinese_ratio
+    else:
+        return "en", 1.0 - chinese_ratio
+
+
+def extract_technical_terms(text: str, domain: Optional[str] = None, language: Optional[str] = None) -> List[str]:
+    """提取技术术语
+
+    Args:
+        text: 文本
+        domain: 领域
+        language: 语言
+
+    Returns:
+        技术术语列表
+    """
+    # 如果未指定语言，检测语言
+    if language is None:
+        language, _ = detect_natural_language(text)
+
+    # 提取技术术语
+    terms = set()
+
+    # 提取代码块中的术语
+    code_blocks = _CODE_BLOCK_RE.findall(text)
+    for block in code_blocks:
+        # 提取变量名、函数名、类名等
+        identifiers = _find_identifiers(block)
+        terms.update(identifiers)
+
+    # 提取行内代码中的术语
+    inline_codes = _INLINE_CODE_RE.findall(text)
+    for code in inline_codes:
+        # 提取变量名、函数名、类名等
+        identifiers = _find_identifiers(code)
+        terms.update(identifiers)
+
+    # 过滤掉代码中常见的非技术词
+    filtered_terms = _filter_common_words(terms)
+
+    # 提取常见技术术语：文本只转换一次小写，术语的小写形式按领域和语言缓存，且缓存时已过滤过常见词
+    text_lower = text.lower()
+    filtered_terms.update(
+        term for term, term_lower in _lowered_common_terms(domain, language) if term_lower in text_lower
+    )
+
+    return list(filtered_terms)
+
 
-    # 过滤掉常见的非技术词和长度小于 2 的词
-    return {term for term in terms if term.lower() not in common_words and len(term) > 1}
+def _find_identifiers(code: str) -> List[str]:
+    """提取代码中的标识符，结果与 _IDENTIFIER_RE.findall 相同
+
+    Args:
+        code: 代码文本
+
+    Returns:
+        标识符列表
+    """
+    # 含非 ASCII 字符时 \b 需要按 Unicode 判断单词边界，交给正则处理
+    if not code.isascii():
+        return _IDENTIFIER_RE.findall(code)
+
+    # 纯 ASCII 文本按字节查表把非标识符字符替换为空格后切分，每个片段都是完整的单词，
+    # 以数字开头的片段中不存在单词边界，正则不会匹配
+    tokens = code.encode("ascii").translate(_IDENTIFIER_TABLE).decode("ascii").split()
+    return [token for token in tokens if not token[0].isdigit()]
+
+
+@functools.lru_cache(maxsize=None)
+def _lowered_common_terms(domain: Optional[str], language: Optional[str]) -> Tuple[Tuple[str, str], ...]:
+    """获取常见技术术语及其小写形式，结果按领域和语言缓存
+
+    常见的非技术词和长度小于 2 的术语在这里预先剔除，匹配到的术语无需再经过 _filter_common_words。
+
+    Args:
+        domain: 领域
+        language: 语言
+
+    Returns:
+        (术语, 小写术语) 元组
+    """
+    lowered_terms = ((term, term.lower()) for term in _get_common_technical_terms(domain, language))
+    return tuple(
+        (term, term_lower) for term, term_lower in lowered_terms if len(term) > 1 and term_lower not in _COMMON_WORDS
+    )
+
+
+def _get_common_technical_terms(domain: Optional[str] = None, language: Optional[str] = None) -> FrozenSet[str]:
+    """获取常见技术术语
+
+    Args:
+        domain: 领域
+        language: 语言
+
+    Returns:
+        常见技术术语集合
+    """
+    # 术语集合在模块加载时构建，这里只按领域和语言组合
+    common_terms = _COMMON_TERMS_BASE
+
+    # 根据领域添加特定术语
+    if domain == "web":
+        common_terms |= _COMMON_TERMS_WEB
+    elif domain == "data":
+        common_terms |= _COMMON_TERMS_DATA
+
+    # 根据语言添加特定术语
+    if language == "zh":
+        common_terms |= _COMMON_TERMS_ZH
+
+    return common_terms
+
+
+def _filter_common_words(terms: Set[str]) -> Set[str]:
+    """过滤常见的非技术词
+
+    Args:
+        terms: 术语集合
+
+    Returns:
+        过滤后的术语集合
+    """
+    # 过滤掉常见的非技术词和长度小于 2 的词：先做廉价的长度判断，每个术语只转换一次小写。
+    # 常见词都只由字母组成，含数字或下划线的标识符（isalpha 为 False）不可能是常见词，无需转换小写和查找集合
+    return {term for term in terms if len(term) > 1 and (not term.isalpha() or term.lower() not in _COMMON_WORDS)}
@@ -1,11 +1,12 @@
 """LLM 客户端基础类，提供初始化和配置功能。"""
 
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import litellm
 
 from ..logger import log_and_notify
+from .llm_client_cache import LLMResponseCache, get_response_cache
 
 
 class LLMClientBase:
@@ -45,6 +46,9 @@ class LLMClientBase:
         self.langfuse_enabled = self.langfuse_config.get("enabled", False)
         self.langfuse = None
 
+        # 响应缓存，未启用缓存时为 None
+        self.response_cache = self._create_response_cache()
+
         # 配置 LiteLLM
         self._configure_litellm()
 
@@ -93,30 +97,43 @@ class LLMClientBase:
         if headers:
             litellm.headers = headers  # type: ignore[assignment]
 
-        # 配置缓存
-        self._configure_cache()
+    def _create_response_cache(self) -> Optional[LLMResponseCache]:
+        """根据缓存配置获取进程内共享的响应缓存
+
+        cache 配置只启用这一层缓存，不再另外设置 LiteLLM 的缓存，避免同一个请求在两层缓存中按不同规则保存和淘汰。
 
-    def _configure_cache(self) -> None:
-        """配置 LiteLLM 缓存"""
+        Returns:
+            响应缓存，未启用缓存时返回 None
+        """
         cache_config = self.config.get("cache", {})
-        if cache_config.get("enabled", False):
-            try:
-                # 获取缓存目录
-                cache_dir = cache_config.get("dir", ".cache/llm")
-
-                # 确保缓存目录存在
-                os.makedirs(cache_dir, exist_ok=True)
-
-                # 设置缓存环境变量
-                os.environ["LITELLM_CACHE"] = "true"
-                os.environ["LITELLM_CACHE_TYPE"] = "redis"
-                os.environ["LITELLM_CACHE_HOST"] = "memory"
-                os.environ["LITELLM_CACHE_PORT"] = "6379"
-                os.environ["LITELLM_CACHE_TTL"] = str(cache_config.get("ttl", 86400))
-
-                log_and_notify(f"LiteLLM 缓存已启用，TTL: {cache_config.get('ttl', 86400)}秒", "info")
-            except Exception as e:
-                log_and_notify(f"配置 LiteLLM 缓存失败: {str(e)}", "error")
+        if not cache_config.get("enabled", False):
+            return None
+
+        return get_response_cache(
+            maxsize=cache_config.get("maxsize", 256),
+            ttl=cache_config.get("ttl", 86400),
+            path=cache_config.get("dir"),
+        )
+
+    def get_response_cache_key(
+        self, model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int]
+    ) -> Optional[str]:
+        """获取请求的响应缓存键
+
+        只缓存温度为 0 的确定性请求，温度大于 0 时每次调用都应得到新的采样结果。
+
+        Args:
+            model: 模型名称
+            messages: 实际发送的消息列表
+            temperature: 温度参数
+            max_tokens: 最大输出 token 数
+
+        Returns:
+            缓存键，未启用缓存或请求不可缓存时返回 None
+        """
+        if self.response_cache is None or temperature != 0:
+            return None
+        return LLMResponseCache.make_key(model, messages, temperature, max_tokens)
 
     def _get_model_string(self) -> str:
         """获取模型字符串，使用 LiteLLM 的模型解析格式
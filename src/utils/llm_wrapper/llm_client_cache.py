@@ -0,0 +1,129 @@
+"""LLM 响应缓存，按规范化的请求内容缓存完全相同请求的响应。"""
+
+import copy
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import diskcache
+
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+from ..logger import log_and_notify
+
+
+class LLMResponseCache:
+    """线程安全的 LLM 响应缓存
+
+    默认在内存中按 LRU 策略保留最近的响应；安装了 diskcache 且指定了缓存目录时，响应保存到磁盘，
+    可以在多个进程和多次运行之间共享。每次读取都返回响应的独立副本，调用方修改响应不会影响缓存和其他调用方。
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 86400, path: Optional[str] = None):
+        """初始化 LLM 响应缓存
+
+        Args:
+            maxsize: 内存缓存的最大条目数
+            ttl: 缓存有效期，单位：秒
+            path: diskcache 缓存目录，为 None 或未安装 diskcache 时使用内存缓存
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._disk_cache = None
+
+        if path:
+            if HAS_DISKCACHE:
+                self._disk_cache = diskcache.Cache(path)
+            else:
+                log_and_notify("未安装 diskcache，LLM 响应缓存仅保存在内存中", "info")
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: Optional[int]) -> str:
+        """根据请求内容生成缓存键
+
+        Args:
+            model: 模型名称
+            messages: 实际发送的消息列表
+            temperature: 温度参数
+            max_tokens: 最大输出 token 数
+
+        Returns:
+            请求内容规范化 JSON 的 BLAKE2b 摘要
+        """
+        request = {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+        canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """读取缓存的响应
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存响应的副本，未命中或已过期时返回 None
+        """
+        if self._disk_cache is not None:
+            # diskcache 每次读取都会重新反序列化，得到的已经是独立的对象
+            return self._disk_cache.get(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expire_at, response = entry
+            if expire_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(response)
+
+    def set(self, key: str, response: Any) -> None:
+        """写入响应，超出条目数上限时淘汰最久未使用的响应
+
+        Args:
+            key: 缓存键
+            response: LLM 响应
+        """
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, response, expire=self.ttl)
+            return
+
+        # 保存副本，调用方之后修改响应不会影响缓存
+        response = copy.deepcopy(response)
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+        with self._lock:
+            self._entries.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def get_response_cache(maxsize: int = 256, ttl: float = 86400, path: Optional[str] = None) -> LLMResponseCache:
+    """获取进程内共享的 LLM 响应缓存，相同配置的客户端使用同一个缓存实例
+
+    Args:
+        maxsize: 内存缓存的最大条目数
+        ttl: 缓存有效期，单位：秒
+        path: diskcache 缓存目录
+
+    Returns:
+        LLM 响应缓存
+    """
+    return LLMResponseCache(maxsize=maxsize, ttl=ttl, path=path)
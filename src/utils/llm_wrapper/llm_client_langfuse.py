@@ -90,13 +90,14 @@ class LLMClientLangfuse:
             name="LLM 请求", model=model, input=messages, metadata={"temperature": temp, "max_tokens": tokens}
         )
 
-    def record_result(self, trace: Any, generation: Any, response: Any) -> None:
+    def record_result(self, trace: Any, generation: Any, response: Any, cache_hit: bool = False) -> None:
         """记录 Langfuse 结果
 
         Args:
             trace: 跟踪对象
             generation: 生成对象
             response: LLM 响应
+            cache_hit: 响应是否来自响应缓存，为 True 时 usage 是首次调用时的用量
         """
         if not (trace and generation and self.base_client.langfuse_enabled):
             return
@@ -106,6 +107,7 @@ class LLMClientLangfuse:
             metadata={
                 "finish_reason": self.utils_client._get_finish_reason(response),
                 "usage": getattr(response, "usage", response.get("usage", {})),
+                "cache_hit": cache_hit,
             },
         )
 
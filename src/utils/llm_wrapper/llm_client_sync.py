@@ -76,12 +76,25 @@ class LLMClientSync:
             model_name, messages, truncated_messages, temp, tokens, trace_id, trace_name
         )
 
+        # 查询响应缓存，相同的确定性请求命中时不再调用 LLM，命中同样记录到 Langfuse 跟踪中
+        cache_key = self.base_client.get_response_cache_key(model_name, truncated_messages, temp, tokens)
+        if cache_key is not None:
+            cached_response = self.base_client.response_cache.get(cache_key)
+            if cached_response is not None:
+                log_and_notify(f"命中 LLM 响应缓存: {model_name}", "info")
+                self.langfuse_client.record_result(trace, generation, cached_response, cache_hit=True)
+                return cached_response
+
         try:
             # 调用 LLM
             response = litellm.completion(
                 model=model_name, messages=truncated_messages, temperature=temp, max_tokens=tokens
             )
 
+            # 缓存响应
+            if cache_key is not None:
+                self.base_client.response_cache.set(cache_key, response)
+
             # 记录 Langfuse 结果
             self.langfuse_client.record_result(trace, generation, response)
 
@@ -12,10 +12,13 @@ from src.utils.formatter import (
     add_emojis_to_headings,
     create_code_links,
     format_markdown,
+    format_markdown_cache_stats,
     generate_module_detail_page,
+    generate_module_index_files,
     generate_navigation_links,
     generate_toc,
     map_module_to_docs_path,
+    resolve_module_links,
     split_content_into_files,
 )
 
@@ -85,6 +88,26 @@ class TestFormatter(unittest.TestCase):
         self.assertIn("这是一个测试文档。", result)
         self.assertNotIn("## 系统架构", result)
 
+        # 相同输入再次格式化时命中缓存，且仍会补全调用方字典中缺失的键
+        first = format_markdown({"title": "缓存"}, template=custom_template, nav_links=False, add_emojis=False)
+        hits = format_markdown_cache_stats()["hits"]
+        repeated_dict = {"title": "缓存"}
+        repeated = format_markdown(repeated_dict, template=custom_template, nav_links=False, add_emojis=False)
+        self.assertEqual(first, repeated)
+        self.assertEqual(format_markdown_cache_stats()["hits"], hits + 1)
+        # 缺失的键按空字符串填充，不会写回调用方的字典
+        self.assertNotIn("faq", repeated_dict)
+
+        # 不可冻结的值不走缓存
+        uncached = format_markdown({"title": ["a"]}, template="# {title}", nav_links=False, add_emojis=False, toc=False)
+        self.assertEqual(uncached, "# ['a']")
+
+        # 含转换或格式说明的模板交由 str.format 处理，结果一致
+        formatted = format_markdown(
+            {"title": "T"}, template="{title!r} {title:>3} {{x}}", nav_links=False, add_emojis=False, toc=False
+        )
+        self.assertEqual(formatted, "'T'   T {x}")
+
     def test_generate_toc(self):
         """测试 generate_toc 函数"""
         # 准备测试数据
@@ -113,6 +136,16 @@ class TestFormatter(unittest.TestCase):
         self.assertIn("  - [子部分1](#子部分1)", result)
         self.assertIn("- [第二部分](#第二部分)", result)
 
+        # 没有二级及以下标题时只返回目录标题
+        self.assertEqual(generate_toc("# 文档标题\n\n正文内容"), "## 目录\n")
+
+        # 相同文本再次生成目录时命中缓存
+        from src.utils.formatter import _cached_toc
+
+        hits_before = _cached_toc.cache_info().hits
+        self.assertEqual(generate_toc(markdown_text), result)
+        self.assertEqual(_cached_toc.cache_info().hits, hits_before + 1)
+
     def test_generate_navigation_links(self):
         """测试 generate_navigation_links 函数"""
         # 准备测试数据
@@ -187,6 +220,27 @@ class TestFormatter(unittest.TestCase):
             "[`format_markdown`](https://github.com/user/repo/blob/main/src/utils/formatter.py#L10-L20)", result
         )
 
+        # 相同输入重复调用时直接命中结果缓存
+        from src.utils.formatter import _cached_code_links
+
+        hits_before = _cached_code_links.cache_info().hits
+        self.assertEqual(create_code_links(code_references, repo_url, "main", context_text), result)
+        self.assertEqual(_cached_code_links.cache_info().hits, hits_before + 1)
+
+        # 与 int 相等的 bool、float 行号不会命中 int 行号的缓存结果
+        int_ref = [{"function_name": "f", "file_path": "a.py", "line_start": 1, "line_end": 1}]
+        self.assertIn("#L1-L1", create_code_links(int_ref, repo_url, "main", "`f`"))
+        bool_ref = [{"function_name": "f", "file_path": "a.py", "line_start": True, "line_end": True}]
+        self.assertIn("#LTrue-LTrue", create_code_links(bool_ref, repo_url, "main", "`f`"))
+        float_ref = [{"function_name": "f", "file_path": "a.py", "line_start": 1.0, "line_end": 1.0}]
+        self.assertIn("#L1.0-L1.0", create_code_links(float_ref, repo_url, "main", "`f`"))
+
+        # 同一标识符的每次出现都会被替换为链接
+        other_result = create_code_links([{"module_name": "formatter"}], context_text="另见 `formatter`，`formatter`。")
+        self.assertEqual(
+            other_result, "另见 [`formatter`](../utils/formatter.md)，[`formatter`](../utils/formatter.md)。"
+        )
+
         # 调用函数 - 标准模式
         result = create_code_links(code_references, repo_url, "main")
 
@@ -231,6 +285,9 @@ class TestFormatter(unittest.TestCase):
         self.assertIn("## 📦 模块", result)
         self.assertIn("## 📋 自定义标题", result)
 
+        # 没有标题行的文本原样返回
+        self.assertEqual(add_emojis_to_headings("#include <stdio.h>\n用 C#编写"), "#include <stdio.h>\n用 C#编写")
+
     def test_split_content_into_files(self):
         """测试 split_content_into_files 函数"""
         repo_name_for_test = "test_repo"
@@ -393,6 +450,61 @@ class TestFormatter(unittest.TestCase):
             f"category: {repo_name_for_test.replace('-', ' ').title()}", utils_index_content
         )  # Parent is repo_name
 
+    def test_split_content_into_files_module_dirs_written_once(self):
+        """测试 split_content_into_files 对重复的模块目录只生成一次索引"""
+        repo_name = "test_repo"
+        os.makedirs(os.path.join(self.test_output_dir, repo_name, "utils"), exist_ok=True)
+        with open(os.path.join(self.test_output_dir, repo_name, "utils", "formatter.md"), "w", encoding="utf-8") as f:
+            f.write("# Formatter")
+
+        generated_files = split_content_into_files(
+            {"repo_name": repo_name},
+            self.test_output_dir,
+            module_dirs=[f"{repo_name}/utils", f"{repo_name}/utils", f"{repo_name}/utils/", f"./{repo_name}//utils"],
+        )
+
+        index_path = os.path.join(self.test_output_dir, f"{repo_name}/utils/index.md")
+        self.assertEqual(generated_files, [index_path])
+        with open(index_path, "r", encoding="utf-8") as f:
+            index_content = f.read()
+        self.assertIn("title: Utils 模块\ncategory: Test_Repo", index_content)
+        self.assertIn("- [Formatter](formatter.md)", index_content)
+
+    def test_default_file_structure_cached(self):
+        """测试默认文件结构按仓库名缓存"""
+        from src.utils.formatter import _default_file_structure
+
+        structure = _default_file_structure("test_repo")
+        self.assertIs(_default_file_structure("test_repo"), structure)
+        self.assertIn("test_repo/overview.md", structure)
+        self.assertTrue(structure["test_repo/index.md"]["default_content"].startswith("# Test_repo 文档"))
+
+    def test_resolve_module_links(self):
+        """测试 resolve_module_links 函数"""
+        doc_paths = {"formatter": "docs/repo/utils/formatter.md", "logic": "docs/repo/core/logic.md"}
+        content = (
+            "见 #TODO_MODULE_LINK#\\{formatter\\} 和 #TODO_MODULE_LINK#\\{logic\\}，"
+            "再次引用 #TODO_MODULE_LINK#\\{formatter\\}，未知 #TODO_MODULE_LINK#\\{unknown\\}"
+        )
+
+        result = resolve_module_links(content, "docs/repo/core/index.md", doc_paths)
+
+        self.assertEqual(
+            result,
+            "见 ../utils/formatter.md 和 logic.md，再次引用 ../utils/formatter.md，"
+            "未知 #TODO_MODULE_LINK#\\{unknown\\}",
+        )
+        self.assertEqual(resolve_module_links(content, "docs/repo/index.md", {}), content)
+
+        # 内容相同的另一个映射按摘要命中缓存，映射不同时不会复用旧结果
+        from src.utils.formatter import _resolve_module_links_cached
+
+        hits_before = _resolve_module_links_cached.cache_info().hits
+        self.assertEqual(resolve_module_links(content, "docs/repo/core/index.md", dict(doc_paths)), result)
+        self.assertEqual(_resolve_module_links_cached.cache_info().hits, hits_before + 1)
+        moved_paths = {**doc_paths, "formatter": "docs/repo/core/formatter.md"}
+        self.assertIn("见 formatter.md", resolve_module_links(content, "docs/repo/core/index.md", moved_paths))
+
     def test_map_module_to_docs_path(self):
         """测试 map_module_to_docs_path 函数"""
         # 准备测试数据
@@ -415,6 +527,33 @@ class TestFormatter(unittest.TestCase):
         self.assertEqual(result3, "docs/helpers/string-utils.md")
         self.assertEqual(result4, "docs/unknown-module.md")
 
+    def test_generate_module_index_files(self):
+        """测试 generate_module_index_files 函数"""
+        for module_dir in ["utils", "core"]:
+            os.makedirs(os.path.join(self.test_output_dir, module_dir), exist_ok=True)
+        for rel_path in ["utils/string_utils.md", "utils/formatter.md", "core/logic.md"]:
+            with open(os.path.join(self.test_output_dir, rel_path), "w", encoding="utf-8") as f:
+                f.write("# doc")
+
+        result = generate_module_index_files(
+            self.test_output_dir, "test_repo", ["utils", "core", "utils/", "missing"], ["existing.md"], True
+        )
+
+        self.assertEqual(
+            result,
+            [
+                "existing.md",
+                os.path.join(self.test_output_dir, "utils", "index.md"),
+                os.path.join(self.test_output_dir, "core", "index.md"),
+            ],
+        )
+        with open(os.path.join(self.test_output_dir, "utils", "index.md"), "r", encoding="utf-8") as f:
+            utils_index = f.read()
+        self.assertIn("title: Utils\ncategory: test_repo", utils_index)
+        self.assertIn("# 📁 Utils", utils_index)
+        self.assertIn("- [Formatter](formatter.md)\n- [String Utils](string_utils.md)", utils_index)
+        self.assertNotIn("index.md", utils_index)
+
     def test_generate_module_detail_page(self):
         """测试 generate_module_detail_page 函数"""
         # 准备测试数据
@@ -467,6 +606,16 @@ class TestFormatter(unittest.TestCase):
         self.assertIn("[Formatter](../utils/formatter.md)", result)
         self.assertIn("[Parser](../utils/parser.md)", result)
 
+        # 相同输入命中缓存，输出保持一致；不可哈希的输入回退到直接渲染
+        self.assertEqual(
+            generate_module_detail_page(module_name, module_info, code_references, repo_url, related_modules), result
+        )
+        unhashable_info = dict(module_info, examples=["不可哈希"])
+        self.assertIn(
+            "## 💻 示例\n\n['不可哈希']",
+            generate_module_detail_page(module_name, unhashable_info, code_references, repo_url, related_modules),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,8 @@
 此模块包含对AsyncGenerateModuleDetailsNode类的测试，验证其处理模块内容的能力。
 """
 
+import os
+
 import pytest
 
 from src.nodes.generate_module_details_node import AsyncGenerateModuleDetailsNode
@@ -16,3 +18,27 @@ async def test_process_module_content():
     assert isinstance(result, str)
     assert "---" in result  # 验证元数据部分
     assert "# 📦" in result  # 验证标题部分
+
+
+def test_ensure_dir_creates_once(tmp_path, monkeypatch):
+    """测试输出目录只创建一次"""
+    node = AsyncGenerateModuleDetailsNode()
+    modules_dir = str(tmp_path / "repo" / "modules")
+    calls = []
+    original_makedirs = os.makedirs
+
+    def counting_makedirs(path, exist_ok=False):
+        calls.append(path)
+        original_makedirs(path, exist_ok=exist_ok)
+
+    monkeypatch.setattr("src.nodes.generate_module_details_node.os.makedirs", counting_makedirs)
+    node._ensure_dir(modules_dir)
+    node._ensure_dir(modules_dir)
+    assert (tmp_path / "repo" / "modules").is_dir()
+    assert calls.count(modules_dir) == 1
+
+    # 已存在的目录不再调用 os.makedirs
+    existing_dir = str(tmp_path / "repo")
+    node._ensure_dir(existing_dir)
+    assert existing_dir in node._created_dirs
+    assert calls.count(existing_dir) == 1
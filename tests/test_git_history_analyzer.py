@@ -0,0 +1,238 @@
+"""测试 Git 历史分析器"""
+
+import os
+import subprocess
+
+import pytest
+
+from src.utils.git_utils.history_analyzer import GitHistoryAnalyzer
+
+# 测试仓库中提交使用的作者和提交者信息，不依赖本机的 git 配置
+_GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Tester",
+    "GIT_AUTHOR_EMAIL": "tester@example.com",
+    "GIT_COMMITTER_NAME": "Tester",
+    "GIT_COMMITTER_EMAIL": "tester@example.com",
+    "GIT_CONFIG_NOSYSTEM": "1",
+}
+
+
+def _git(repo_path, *args):
+    """在测试仓库中执行 git 命令并返回输出"""
+    env = {**os.environ, **_GIT_ENV, "HOME": str(repo_path)}
+    result = subprocess.run(
+        ["git", "-c", "commit.gpgsign=false", *args],
+        cwd=repo_path,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+def _commit_file(repo_path, file_name, content, message):
+    """写入文件并提交，返回提交哈希"""
+    mode = "wb" if isinstance(content, bytes) else "w"
+    with open(os.path.join(repo_path, file_name), mode) as f:
+        f.write(content)
+    _git(repo_path, "add", "--", file_name)
+    _git(repo_path, "commit", "-q", "-m", message)
+    return _git(repo_path, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """将历史缓存目录指向临时目录"""
+    path = str(tmp_path / "cache")
+    monkeypatch.setattr(GitHistoryAnalyzer, "CACHE_DIR", path)
+    return path
+
+
+@pytest.fixture
+def git_repo(tmp_path, cache_dir):
+    """创建包含 5 个线性提交的测试仓库"""
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    _git(repo_path, "init", "-q", "-b", "main")
+    for i in range(5):
+        _commit_file(repo_path, "a.txt", "".join(f"line {j}\n" for j in range(i + 1)), f"commit {i}")
+    return repo_path
+
+
+class TestCommitStats:
+    """测试提交的变更统计"""
+
+    def test_merge_commit_compared_with_first_parent(self, git_repo):
+        """测试合并提交的统计与第一个父提交比较"""
+        _git(git_repo, "checkout", "-q", "-b", "feature")
+        _commit_file(git_repo, "feature.txt", "a\nb\nc\n", "add feature")
+        _git(git_repo, "checkout", "-q", "main")
+        _commit_file(git_repo, "main.txt", "x\n", "add main")
+        _git(git_repo, "merge", "-q", "--no-ff", "-m", "merge feature", "feature")
+
+        details = GitHistoryAnalyzer(str(git_repo), use_cache=False).get_commit_details("HEAD")
+
+        assert details["message"] == "merge feature"
+        assert details["file_changes"] == [{"path": "feature.txt", "insertions": 3, "deletions": 0, "changes": 3}]
+        assert details["stats"] == {"files": 1, "insertions": 3, "deletions": 0}
+
+    def test_binary_file_counts_zero_lines(self, git_repo):
+        """测试二进制文件的 numstat 行数为 "-" 时计为 0"""
+        _commit_file(git_repo, "image.bin", b"\x00\x01\x02binary", "add binary")
+
+        details = GitHistoryAnalyzer(str(git_repo), use_cache=False).get_commit_details("HEAD")
+
+        assert details["file_changes"] == [{"path": "image.bin", "insertions": 0, "deletions": 0, "changes": 0}]
+        assert details["stats"] == {"files": 1, "insertions": 0, "deletions": 0}
+
+    def test_quoted_file_names(self, git_repo):
+        """测试包含制表符、换行符和非 ASCII 字符的文件名"""
+        file_names = ["tab\tname.txt", "new\nline.txt", "中文.txt"]
+        for file_name in file_names:
+            with open(os.path.join(git_repo, file_name), "w") as f:
+                f.write("content\n")
+        _git(git_repo, "add", "--", *file_names)
+        _git(git_repo, "commit", "-q", "-m", "special names")
+
+        details = GitHistoryAnalyzer(str(git_repo), use_cache=False).get_commit_details("HEAD")
+
+        assert sorted(change["path"] for change in details["file_changes"]) == sorted(file_names)
+        assert details["stats"]["insertions"] == 3
+
+
+class TestCommitQueries:
+    """测试提交历史查询"""
+
+    def test_get_many_commit_details_keeps_order(self, git_repo):
+        """测试并行获取的提交详情与输入顺序一致，不存在的提交对应 None"""
+        hashes = _git(git_repo, "rev-list", "HEAD").split()
+        requested = [hashes[3], hashes[0], "0" * 40, hashes[4], hashes[1]]
+
+        details = GitHistoryAnalyzer(str(git_repo), use_cache=False).get_many_commit_details(requested, max_workers=4)
+
+        assert [detail["hash"] if detail else None for detail in details] == [
+            hashes[3],
+            hashes[0],
+            None,
+            hashes[4],
+            hashes[1],
+        ]
+
+    def test_commit_history_newest_first(self, git_repo):
+        """测试提交历史按时间倒序排列，并统计每个提交的变更"""
+        history = GitHistoryAnalyzer(str(git_repo), use_cache=False).get_commit_history(max_count=3, branch="main")
+
+        assert [commit["message"] for commit in history] == ["commit 4", "commit 3", "commit 2"]
+        assert all(commit["stats"] == {"files": 1, "insertions": 1, "deletions": 0} for commit in history)
+
+
+class TestHistoryCache:
+    """测试历史查询结果的磁盘缓存"""
+
+    def test_cache_hit_and_invalidation(self, git_repo, monkeypatch):
+        """测试相同查询命中缓存，新提交后缓存失效"""
+        analyzer = GitHistoryAnalyzer(str(git_repo))
+        calls = []
+        iter_log = analyzer._iter_log
+
+        def counting_iter_log(*args, **kwargs):
+            calls.append(args)
+            return iter_log(*args, **kwargs)
+
+        monkeypatch.setattr(analyzer, "_iter_log", counting_iter_log)
+
+        first = analyzer.get_commit_history(max_count=10, branch="main")
+        second = analyzer.get_commit_history(max_count=10, branch="main")
+        assert second == first
+        assert len(calls) == 1
+
+        _commit_file(git_repo, "b.txt", "new\n", "commit 5")
+        third = analyzer.get_commit_history(max_count=10, branch="main")
+        assert len(calls) == 2
+        assert third[0]["message"] == "commit 5"
+        assert third[1:] == first[:5]
+
+    def test_cache_non_utf8_file_name(self, git_repo):
+        """测试文件名不是 UTF-8 编码时结果可以写入缓存并原样读回"""
+        file_name = b"caf\xe9.txt"
+        with open(os.path.join(os.fsencode(git_repo), file_name), "w") as f:
+            f.write("content\n")
+        _git(git_repo, "add", "-A")
+        _git(git_repo, "commit", "-q", "-m", "latin-1 name")
+
+        analyzer = GitHistoryAnalyzer(str(git_repo))
+        first = analyzer.get_commit_details("HEAD")
+        second = analyzer.get_commit_details("HEAD")
+
+        assert first is not None
+        assert first["file_changes"][0]["path"] == "caf\udce9.txt"
+        assert second == first
+        assert all(name.endswith(".json") for name in os.listdir(analyzer.cache_path))
+
+    def test_cache_shared_by_clones(self, git_repo, tmp_path):
+        """测试同一仓库克隆到不同目录时使用同一个缓存目录"""
+        clone_paths = [tmp_path / "clone1", tmp_path / "clone2"]
+        for clone_path in clone_paths:
+            _git(tmp_path, "clone", "-q", str(git_repo), str(clone_path))
+
+        first, second = (GitHistoryAnalyzer(str(clone_path)) for clone_path in clone_paths)
+        assert first.cache_path == second.cache_path
+        first.get_commit_history(branch="main")
+        assert os.listdir(second.cache_path)
+
+    def test_uncached_analyzer_skips_repo_identity(self, git_repo, monkeypatch):
+        """测试不使用缓存时不计算缓存目录"""
+
+        def fail_repo_identity(self):
+            raise AssertionError("不应确定仓库标识")
+
+        monkeypatch.setattr(GitHistoryAnalyzer, "_repo_identity", fail_repo_identity)
+        analyzer = GitHistoryAnalyzer(str(git_repo), use_cache=False)
+
+        assert len(analyzer.get_commit_history(branch="main")) == 5
+        assert "cache_path" not in vars(analyzer)
+
+    def test_prune_repo_caches(self, tmp_path, cache_dir, monkeypatch):
+        """测试缓存的仓库数量超出上限时删除最久未使用的仓库缓存"""
+        monkeypatch.setattr(GitHistoryAnalyzer, "CACHE_MAX_REPOS", 2)
+        cache_paths = []
+        for i in range(3):
+            repo_path = tmp_path / f"repo{i}"
+            repo_path.mkdir()
+            _git(repo_path, "init", "-q", "-b", "main")
+            _commit_file(repo_path, "a.txt", f"repo {i}\n", "init")
+            analyzer = GitHistoryAnalyzer(str(repo_path))
+            analyzer.get_commit_history(branch="main")
+            cache_paths.append(analyzer.cache_path)
+            # 保证各缓存目录的修改时间不同
+            os.utime(analyzer.cache_path, (i, i))
+
+        assert sorted(os.listdir(cache_dir)) == sorted(os.path.basename(path) for path in cache_paths[1:])
+
+
+class TestShallowClone:
+    """测试浅克隆仓库的历史加深"""
+
+    @pytest.fixture
+    def shallow_clone(self, git_repo, tmp_path):
+        """从测试仓库浅克隆 1 个提交"""
+        clone_path = tmp_path / "shallow"
+        _git(tmp_path, "clone", "-q", "--depth", "1", f"file://{git_repo}", str(clone_path))
+        return clone_path
+
+    def test_commit_history_deepens_to_max_count(self, shallow_clone):
+        """测试提交历史不足时加深浅克隆的历史"""
+        history = GitHistoryAnalyzer(str(shallow_clone), use_cache=False).get_commit_history(max_count=3, branch="main")
+
+        assert [commit["message"] for commit in history] == ["commit 4", "commit 3", "commit 2"]
+
+    def test_contributors_deepen_bounded(self, shallow_clone, monkeypatch):
+        """测试分析贡献者时只加深有限的历史，并且每个实例只加深一次"""
+        monkeypatch.setattr(GitHistoryAnalyzer, "SHALLOW_DEEPEN_COMMITS", 2)
+        analyzer = GitHistoryAnalyzer(str(shallow_clone), use_cache=False)
+
+        assert analyzer.analyze_contributors() == [{"name": "Tester", "email": "tester@example.com", "commits": 3}]
+        analyzer.get_file_history("a.txt")
+        assert _git(shallow_clone, "rev-list", "--count", "HEAD") == "3"
+        assert os.path.exists(os.path.join(shallow_clone, ".git", "shallow"))
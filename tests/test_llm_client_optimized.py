@@ -136,6 +136,51 @@ class TestLLMClientOptimized(unittest.TestCase):
             response_format={"type": "json_object", "schema": schema},
         )
 
+    @patch("litellm.completion")
+    def test_response_cache(self, mock_completion):
+        """测试温度为 0 的相同请求命中响应缓存"""
+        mock_response = {"choices": [{"message": {"content": "缓存的响应"}}]}
+        mock_completion.return_value = mock_response
+
+        client = LLMClient(
+            {
+                "provider": "openai",
+                "model": "gpt-4",
+                "api_key": "test-key",
+                "temperature": 0,
+                "max_tokens": 1000,
+                "cache": {"enabled": True, "ttl": 3600},
+            }
+        )
+        client.base.response_cache.clear()
+        messages = [{"role": "user", "content": "你好"}]
+
+        # 相同的确定性请求只调用一次 LLM
+        self.assertEqual(client.completion(messages), mock_response)
+        cached_response = client.completion(messages)
+        self.assertEqual(cached_response, mock_response)
+        self.assertEqual(mock_completion.call_count, 1)
+
+        # 命中缓存时同样记录到 Langfuse 跟踪中
+        with patch.object(client.langfuse, "record_result") as mock_record_result:
+            client.completion(messages)
+        self.assertEqual(mock_record_result.call_args.kwargs, {"cache_hit": True})
+        self.assertEqual(mock_completion.call_count, 1)
+
+        # 命中缓存时返回副本，调用方修改响应不影响之后的调用
+        self.assertIsNot(cached_response, mock_response)
+        cached_response["choices"][0]["message"]["content"] = "已修改"
+        self.assertEqual(client.get_completion_content(client.completion(messages)), "缓存的响应")
+
+        # 不同的消息和温度大于 0 的请求不使用缓存
+        client.completion([{"role": "user", "content": "再见"}])
+        client.completion(messages, temperature=0.7)
+        client.completion(messages, temperature=0.7)
+        self.assertEqual(mock_completion.call_count, 4)
+
+        # 未启用缓存的客户端不使用缓存
+        self.assertIsNone(self.client.base.response_cache)
+
 
 if __name__ == "__main__":
     unittest.main()